@@ -2,16 +2,20 @@
 """Check all registered model versions and their aliases"""
 
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
 import mlflow
-from mlflow.tracking import MlflowClient
 from dotenv import load_dotenv
 
+from utils.mlflow_helpers import get_client, iter_model_versions
+
 # Load environment
 load_dotenv('config/.env')
 
 # Setup
 mlflow.set_registry_uri(os.getenv('MLFLOW_REGISTRY_URI', 'databricks-uc'))
-client = MlflowClient()
+client = get_client()
 
 model_name = 'main.news_classifier.news_classifier'
 
@@ -21,16 +25,36 @@ print("=" * 80)
 print()
 
 try:
-    # First get basic version list
-    versions_basic = client.search_model_versions(f"name='{model_name}'")
-    print(f"Total versions registered: {len(versions_basic)}\n")
+    # Paginated search - recent MLflow returns aliases and tags inline,
+    # so no per-version get_model_version round-trip is needed
+    versions = list(iter_model_versions(client, model_name))
+    print(f"Total versions registered: {len(versions)}\n")
+
+    # One get_registered_model call returns the full alias->version map,
+    # so the per-version loop needs zero additional RPCs for aliases
+    alias_by_version = defaultdict(list)
+    try:
+        registered_model = client.get_registered_model(model_name)
+        for alias in registered_model.aliases:
+            alias_by_version[alias.version].append(alias.alias)
+    except Exception:
+        # Fall back to whatever aliases came back on the versions themselves
+        for v in versions:
+            for alias in getattr(v, 'aliases', []) or []:
+                alias_by_version[v.version].append(alias)
 
-    # Then get detailed info for each version
-    for v_basic in sorted(versions_basic, key=lambda x: int(x.version)):
-        # Get full version details with tags (required for Unity Catalog)
-        v = client.get_model_version(model_name, v_basic.version)
+    # Capability probe: older servers omit aliases/tags from search results.
+    # Fall back to concurrent per-version fetches instead of a serial N+1 loop.
+    if versions and (not hasattr(versions[0], 'aliases') or not versions[0].tags):
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            versions = list(executor.map(
+                lambda v: client.get_model_version(model_name, v.version),
+                versions
+            ))
 
-        aliases = v.aliases if hasattr(v, 'aliases') else []
+    # Sort only after fetching so the pool isn't blocked on ordering
+    for v in sorted(versions, key=lambda x: int(x.version)):
+        aliases = alias_by_version.get(v.version, [])
         tags = v.tags if hasattr(v, 'tags') else {}
 
         provider = tags.get('provider', 'unknown') if tags else 'unknown'
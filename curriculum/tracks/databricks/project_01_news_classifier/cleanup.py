@@ -9,17 +9,21 @@ WARNING: This will permanently delete:
 
 import os
 import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import mlflow
-from mlflow.tracking import MlflowClient
 from dotenv import load_dotenv
 
+from utils.mlflow_helpers import get_client, iter_experiment_runs, iter_model_versions
+
 # Load environment
 load_dotenv('config/.env')
 
 # Setup
 mlflow.set_tracking_uri(os.getenv('MLFLOW_TRACKING_URI', 'databricks'))
 mlflow.set_registry_uri(os.getenv('MLFLOW_REGISTRY_URI', 'databricks-uc'))
-client = MlflowClient()
+client = get_client()
 
 # Configuration
 UC_CATALOG = os.getenv('UC_CATALOG', 'main')
@@ -28,6 +32,12 @@ MODEL_NAME = f"{UC_CATALOG}.{UC_SCHEMA}.news_classifier"
 EXPERIMENT_EXTERNAL = os.getenv('MLFLOW_EXPERIMENT_NAME_EXTERNAL', '/Users/samlexrod@gmail.com/news-classifier-external')
 EXPERIMENT_INTERNAL = os.getenv('MLFLOW_EXPERIMENT_NAME_INTERNAL', '/Users/samlexrod@gmail.com/news-classifier-internal')
 
+# Width of the deletion thread pool - tune down if the server rate-limits
+CLEANUP_PARALLELISM = int(os.getenv('CLEANUP_PARALLELISM', '16'))
+
+# Cap on queued run deletions so listing and deleting stay pipelined
+MAX_IN_FLIGHT_DELETES = 64
+
 
 def delete_model_versions():
     """Delete all versions of the Unity Catalog model"""
@@ -37,8 +47,8 @@ def delete_model_versions():
     print(f"Model: {MODEL_NAME}\n")
 
     try:
-        # Get all versions
-        versions = client.search_model_versions(f"name='{MODEL_NAME}'")
+        # Get all versions (paginated so models with >100 versions aren't truncated)
+        versions = list(iter_model_versions(client, MODEL_NAME))
 
         if not versions:
             print(f"⚠️  No versions found for model '{MODEL_NAME}'")
@@ -46,17 +56,25 @@ def delete_model_versions():
 
         print(f"Found {len(versions)} version(s) to delete:\n")
 
-        # Delete each version
-        for v in sorted(versions, key=lambda x: int(x.version), reverse=True):
-            version_num = v.version
-            print(f"  Deleting version {version_num}...")
+        # Delete versions concurrently - each delete is a synchronous REST
+        # round-trip, so a thread pool cuts wall time by roughly the pool width
+        failures = deque()  # deque.append is thread-safe
+
+        def delete_version(v):
             try:
-                client.delete_model_version(MODEL_NAME, version_num)
-                print(f"  ✓ Deleted version {version_num}")
+                client.delete_model_version(MODEL_NAME, v.version)
+                print(f"  ✓ Deleted version {v.version}")
             except Exception as e:
-                print(f"  ❌ Failed to delete version {version_num}: {e}")
+                failures.append((v.version, e))
+                print(f"  ❌ Failed to delete version {v.version}: {e}")
+
+        with ThreadPoolExecutor(max_workers=CLEANUP_PARALLELISM) as executor:
+            list(executor.map(delete_version, versions))
 
-        print(f"\n✓ All versions deleted\n")
+        if failures:
+            print(f"\n⚠️  {len(failures)} version(s) failed to delete\n")
+        else:
+            print(f"\n✓ All versions deleted\n")
 
         # Delete the model itself
         print(f"Deleting model '{MODEL_NAME}'...")
@@ -83,18 +101,34 @@ def delete_experiment(experiment_name):
 
         experiment_id = experiment.experiment_id
 
-        # Get all runs in the experiment
-        runs = client.search_runs(experiment_ids=[experiment_id])
-        print(f"  Found {len(runs)} run(s) to delete")
+        # Stream runs page by page and delete concurrently - deletion starts
+        # before the full listing finishes, and memory stays constant no
+        # matter how many runs the experiment holds
+        failures = deque()
+        total = 0
 
-        # Delete all runs
-        for run in runs:
+        def delete_run(run):
             try:
                 client.delete_run(run.info.run_id)
                 print(f"    ✓ Deleted run {run.info.run_id}")
             except Exception as e:
+                failures.append((run.info.run_id, e))
                 print(f"    ❌ Failed to delete run {run.info.run_id}: {e}")
 
+        with ThreadPoolExecutor(max_workers=CLEANUP_PARALLELISM) as executor:
+            in_flight = set()
+            for run in iter_experiment_runs(client, experiment_id):
+                total += 1
+                in_flight.add(executor.submit(delete_run, run))
+                # Bound the queue so the producer doesn't outrun the pool
+                if len(in_flight) >= MAX_IN_FLIGHT_DELETES:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            wait(in_flight)
+
+        print(f"  Deleted {total - len(failures)} of {total} run(s)")
+        if failures:
+            print(f"  ⚠️  {len(failures)} run(s) failed to delete")
+
         # Delete the experiment
         print(f"  Deleting experiment {experiment_id}...")
         try:
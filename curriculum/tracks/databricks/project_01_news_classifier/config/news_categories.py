@@ -2,6 +2,8 @@
 News classification categories and prompts for zero-shot learning
 """
 
+import os
+
 # News categories for classification
 NEWS_CATEGORIES = [
     "Politics",
@@ -70,4 +72,38 @@ Instructions:
    Category: <category_name>
    Sentiment: <sentiment_name>
 
-Response:"""
\ No newline at end of file
+Response:"""
+
+# The category/sentiment lists are invariant, so bake them into the
+# templates once at import time; per-article rendering then only has to
+# fill in title and content instead of re-formatting the constant fields.
+_CAT_STR = ", ".join(NEWS_CATEGORIES)
+_SENT_STR = ", ".join(SENTIMENT_CATEGORIES)
+
+_CLASSIFICATION_TEMPLATE = CLASSIFICATION_PROMPT_TEMPLATE.replace("{categories}", _CAT_STR)
+_SENTIMENT_TEMPLATE = SENTIMENT_PROMPT_TEMPLATE.replace("{sentiments}", _SENT_STR)
+_COMBINED_TEMPLATE = (
+    COMBINED_PROMPT_TEMPLATE
+    .replace("{categories}", _CAT_STR)
+    .replace("{sentiments}", _SENT_STR)
+)
+
+# Classification decisions rarely change past the opening of an article,
+# so cap the content shipped per prompt - input tokens are the dominant
+# cost and latency driver for long articles
+CONTENT_CHAR_BUDGET = int(os.getenv("PROMPT_CONTENT_MAX_CHARS", "2000"))
+
+
+def render_classification(title: str, content: str) -> str:
+    """Render the category classification prompt for one article"""
+    return _CLASSIFICATION_TEMPLATE.format(title=title, content=content[:CONTENT_CHAR_BUDGET])
+
+
+def render_sentiment(title: str, content: str) -> str:
+    """Render the sentiment analysis prompt for one article"""
+    return _SENTIMENT_TEMPLATE.format(title=title, content=content[:CONTENT_CHAR_BUDGET])
+
+
+def render_combined(title: str, content: str) -> str:
+    """Render the combined category + sentiment prompt for one article"""
+    return _COMBINED_TEMPLATE.format(title=title, content=content[:CONTENT_CHAR_BUDGET])
\ No newline at end of file
@@ -10,10 +10,12 @@ All experiments register to the same model: main.news_classifier.news_classifier
 
 import os
 import sys
-import subprocess
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dotenv import load_dotenv
 
+# The experiment modules (and their mlflow/pandas imports) are loaded
+# inside the worker processes, so the orchestrator itself starts fast
+
 # Load environment variables
 load_dotenv('config/.env')
 
@@ -28,7 +30,11 @@ def print_header(message: str, char: str = "="):
 
 def run_experiment(track: str, provider: str = None, model: str = None) -> bool:
     """
-    Run a single experiment by calling Python scripts directly
+    Run a single experiment in-process (executed inside a worker process)
+
+    Importing and calling run_experiment() directly avoids re-launching a
+    Python interpreter per experiment, while process isolation still gives
+    each experiment its own MLflow run context.
 
     Args:
         track: 'external' or 'internal'
@@ -38,44 +44,28 @@ def run_experiment(track: str, provider: str = None, model: str = None) -> bool:
     Returns:
         bool: True if experiment succeeded, False otherwise
     """
+    if track == "external":
+        display_name = f"External: {provider.upper()}"
+    else:  # internal
+        display_name = f"Internal: {model}"
+
     try:
-        # Construct command
-        if track == "external":
-            script_path = "track_a_external/experiment_external.py"
-            param_flag = f"--provider={provider}"
-            display_name = f"External: {provider.upper()}"
-        else:  # internal
-            script_path = "track_b_internal/experiment_internal.py"
-            param_flag = f"--model={model}"
-            display_name = f"Internal: {model}"
-
-        print(f"Running {display_name}...")
-        print(f"  Script: {script_path}")
-        print(f"  Parameter: {param_flag}")
-        print()
+        # Clear any inherited MLflow run context so each experiment starts
+        # its own run (same guarantee the old subprocess env.pop provided)
+        os.environ.pop('MLFLOW_RUN_ID', None)
+        os.environ.pop('MLFLOW_EXPERIMENT_ID', None)
+
+        print(f"[{display_name}] Starting...")
 
-        # Run directly via Python (avoids nested MLflow run issues)
-        cmd = ["python", script_path, param_flag]
-
-        # Execute and stream output
-        # Clear MLflow run context to ensure each experiment starts its own run
-        env = os.environ.copy()
-        env.pop('MLFLOW_RUN_ID', None)  # Remove active run ID
-        env.pop('MLFLOW_EXPERIMENT_ID', None)  # Remove experiment ID conflict
-
-        result = subprocess.run(
-            cmd,
-            env=env,
-            capture_output=False,  # Stream output to console
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n✅ {display_name} completed successfully\n")
-            return True
+        if track == "external":
+            from track_a_external.experiment_external import run_experiment as run_external
+            run_external(provider=provider)
         else:
-            print(f"\n❌ {display_name} failed with exit code {result.returncode}\n")
-            return False
+            from track_b_internal.experiment_internal import run_experiment as run_internal
+            run_internal(model=model)
+
+        print(f"\n✅ {display_name} completed successfully\n")
+        return True
 
     except Exception as e:
         print(f"\n❌ {display_name} failed with error: {e}\n")
@@ -83,7 +73,11 @@ def run_experiment(track: str, provider: str = None, model: str = None) -> bool:
 
 
 def main():
-    """Run all experiments sequentially"""
+    """Run all experiments concurrently across worker processes"""
+
+    # Read the experiment names once instead of per print statement
+    external_experiment = os.getenv('MLFLOW_EXPERIMENT_NAME_EXTERNAL', 'External Experiment')
+    internal_experiment = os.getenv('MLFLOW_EXPERIMENT_NAME_INTERNAL', 'Internal Experiment')
 
     print_header("RUNNING ALL EXPERIMENTS - CHAMPION COMPARISON")
 
@@ -93,7 +87,8 @@ def main():
     print()
     print("All models will compete for the Champion alias in: main.news_classifier.news_classifier")
     print()
-    print("⚠️  Note: Each experiment will run sequentially. This may take 20-30 minutes total.")
+    print("⚠️  Note: Experiments run concurrently in separate processes.")
+    print("   Output from different experiments may interleave.")
     print()
 
     print_header("Starting Experiments", "-")
@@ -103,23 +98,31 @@ def main():
 
     # Run all experiments
     experiments = [
-        ("external", "openai", None, "1/4"),
-        ("external", "anthropic", None, "2/4"),
-        ("internal", None, "databricks-gpt-oss-20b", "3/4"),
-        ("internal", None, "databricks-meta-llama-3-3-70b-instruct", "4/4"),
+        ("external", "openai", None),
+        ("external", "anthropic", None),
+        ("internal", None, "databricks-gpt-oss-20b"),
+        ("internal", None, "databricks-meta-llama-3-3-70b-instruct"),
     ]
 
-    for idx, (track, provider, model, progress) in enumerate(experiments, 1):
-        name = provider if provider else model
-        print(f"\n[{progress}] Running {name}...")
-        print("-" * 80)
-
-        success = run_experiment(track, provider, model)
-        results[name] = success
-
-        # Stop if experiment failed and user wants to abort
-        if not success:
-            print(f"\n⚠️  Experiment {name} failed. Continuing with remaining experiments...")
+    # The experiments are independent, I/O-bound LLM workloads - fan them
+    # out across processes so wall time is bounded by the slowest one
+    with ProcessPoolExecutor(max_workers=len(experiments)) as executor:
+        futures = {
+            executor.submit(run_experiment, track, provider, model):
+                (provider if provider else model)
+            for track, provider, model in experiments
+        }
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"\n❌ Experiment {name} crashed: {e}\n")
+                results[name] = False
+
+            if not results[name]:
+                print(f"\n⚠️  Experiment {name} failed. Continuing with remaining experiments...")
 
     # Print summary
     print_header("EXPERIMENT SUMMARY")
@@ -147,8 +150,8 @@ def main():
         print("To view results in Databricks UI:")
         print("  1. Go to Machine Learning → Experiments")
         print("  2. Check both experiment pages:")
-        print(f"     - {os.getenv('MLFLOW_EXPERIMENT_NAME_EXTERNAL', 'External Experiment')}")
-        print(f"     - {os.getenv('MLFLOW_EXPERIMENT_NAME_INTERNAL', 'Internal Experiment')}")
+        print(f"     - {external_experiment}")
+        print(f"     - {internal_experiment}")
         print("  3. Go to Catalog → main → news_classifier → news_classifier")
         print("  4. Check the 'Aliases' tab to see Champion/Challenger/Candidate")
         return 0
@@ -6,12 +6,17 @@ import os
 import sys
 from dotenv import load_dotenv
 import mlflow
+import pandas as pd
 
 # Load environment
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 env_path = os.path.join(project_root, "config", ".env")
 load_dotenv(env_path)
 
+sys.path.append(project_root)
+
+from utils.mlflow_helpers import get_client
+
 # Configure MLflow
 mlflow.set_tracking_uri("databricks")
 
@@ -30,21 +35,58 @@ experiments = [
     os.getenv("MLFLOW_EXPERIMENT_NAME_INTERNAL", "/Users/samlexrod@gmail.com/news-classifier-internal"),
 ]
 
+# Resolve all experiment names in a single REST call instead of one
+# get_experiment_by_name round-trip per entry
+client = get_client()
+try:
+    names_filter = ", ".join(f"'{name}'" for name in experiments)
+    found = {
+        exp.name: exp
+        for exp in client.search_experiments(
+            filter_string=f"name IN ({names_filter})",
+            max_results=len(experiments)
+        )
+    }
+except Exception:
+    # Older servers don't support IN filters - fall back to per-name lookups
+    found = {}
+    for exp_name in experiments:
+        exp = mlflow.get_experiment_by_name(exp_name)
+        if exp:
+            found[exp_name] = exp
+
+# One batched search_runs across all found experiments, sliced per
+# experiment in pandas afterwards
+experiment_ids = [exp.experiment_id for exp in found.values()]
+if experiment_ids:
+    all_runs = mlflow.search_runs(
+        experiment_ids=experiment_ids,
+        max_results=5 * len(experiment_ids)
+    )
+else:
+    all_runs = pd.DataFrame()
+
 for exp_name in experiments:
     print(f"\nChecking: {exp_name}")
     try:
-        exp = mlflow.get_experiment_by_name(exp_name)
+        exp = found.get(exp_name)
         if exp:
             print(f"  ✅ EXISTS")
             print(f"  Experiment ID: {exp.experiment_id}")
             print(f"  Direct URL: {databricks_host}/ml/experiments/{exp.experiment_id}")
 
             # Check for runs
-            runs = mlflow.search_runs(experiment_ids=[exp.experiment_id], max_results=5)
+            if len(all_runs) > 0:
+                runs = all_runs[all_runs['experiment_id'] == exp.experiment_id]
+            else:
+                runs = all_runs
             if len(runs) > 0:
                 print(f"  Runs: {len(runs)} total")
-                for idx, row in runs.iterrows():
-                    print(f"    - {row['tags.mlflow.runName']} (Status: {row['status']})")
+                # zip over numpy arrays - no per-row Series boxing like iterrows
+                run_names = runs['tags.mlflow.runName'].to_numpy()
+                run_statuses = runs['status'].to_numpy()
+                for name, status in zip(run_names, run_statuses):
+                    print(f"    - {name} (Status: {status})")
             else:
                 print(f"  Runs: 0 (no runs yet)")
         else:
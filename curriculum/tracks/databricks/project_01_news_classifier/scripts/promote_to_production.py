@@ -24,20 +24,58 @@ Usage:
     python scripts/promote_to_production.py --auto-approve
 """
 
+from __future__ import annotations
+
 import os
 import sys
+import json
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Tuple
-import mlflow
-from mlflow.tracking import MlflowClient
-from dotenv import load_dotenv
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# mlflow (and the databricks.sdk it drags in) costs seconds to import, so
+# it is loaded inside promote_challenger_to_champion - the --help and
+# argparse-error paths that orchestration health-checks hit stay fast
+
+# One-time MLflow setup (see _init_mlflow_once)
+_INITIALIZED = False
+TRACKING_URI: Optional[str] = None
+REGISTRY_URI: Optional[str] = None
+
+
+def _init_mlflow_once() -> None:
+    """
+    Load .env and configure MLflow URIs exactly once per process
+
+    Orchestrators may call several entry points of this module in one
+    process; parsing the dotenv file and resetting tracking/registry URIs
+    on every call wastes file I/O and risks mid-run URI flips. The resolved
+    URIs are kept in module constants so helpers don't re-read os.getenv.
+    """
+    global _INITIALIZED, TRACKING_URI, REGISTRY_URI
+
+    if _INITIALIZED:
+        return
+
+    import mlflow
+    from dotenv import load_dotenv
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv(os.path.join(project_root, "config", ".env"))
+
+    TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "databricks")
+    REGISTRY_URI = os.getenv("MLFLOW_REGISTRY_URI", "databricks-uc")
+    mlflow.set_tracking_uri(TRACKING_URI)
+    mlflow.set_registry_uri(REGISTRY_URI)
+
+    _INITIALIZED = True
+
 
 def get_model_by_alias(
-    client: MlflowClient,
+    client: "MlflowClient",
     catalog: str,
     schema: str,
     model_name: str,
@@ -80,6 +118,79 @@ def get_model_by_alias(
         return None
 
 
+def list_candidate_models(max_results: int = 50):
+    """
+    List candidate runs from both experiments, best first
+
+    Uses the lower-level client.search_runs with a server-side filter and
+    sort, so ordered Run objects come back directly - no DataFrame
+    materialization, no client-side re-sort, and no silent 10-row cap.
+
+    Args:
+        max_results: Max runs to list per experiment
+    """
+    import mlflow
+
+    from utils.mlflow_helpers import get_client
+
+    _init_mlflow_once()
+    client = get_client()
+
+    experiments = [
+        os.getenv("MLFLOW_EXPERIMENT_NAME_EXTERNAL", "/Users/default/news-classifier-external"),
+        os.getenv("MLFLOW_EXPERIMENT_NAME_INTERNAL", "/Users/default/news-classifier-internal"),
+    ]
+
+    print("=" * 80)
+    print("CANDIDATE MODELS (best first)")
+    print("=" * 80)
+
+    # Resolve both experiment names to IDs in one round-trip instead of a
+    # get_experiment_by_name call per experiment
+    try:
+        names_filter = ", ".join(f"'{name}'" for name in experiments)
+        found = {
+            exp.name: exp
+            for exp in client.search_experiments(
+                filter_string=f"name IN ({names_filter})",
+                max_results=len(experiments)
+            )
+        }
+    except Exception:
+        # Older servers without IN-filter support
+        found = {
+            name: exp for name in experiments
+            if (exp := mlflow.get_experiment_by_name(name)) is not None
+        }
+
+    for exp_name in experiments:
+        print(f"\nExperiment: {exp_name}")
+
+        experiment = found.get(exp_name)
+        if experiment is None:
+            print("  ⚠️  Experiment not found")
+            continue
+
+        runs = client.search_runs(
+            experiment_ids=[experiment.experiment_id],
+            filter_string="metrics.category_accuracy > 0",
+            order_by=["metrics.category_accuracy DESC"],
+            max_results=max_results
+        )
+
+        if not runs:
+            print("  (no runs with metrics yet)")
+            continue
+
+        for run in runs:
+            run_name = run.data.tags.get('mlflow.runName', run.info.run_id)
+            accuracy = run.data.metrics.get('category_accuracy', 0.0)
+            f1 = run.data.metrics.get('category_f1_weighted', 0.0)
+            print(f"  {run_name:<45} accuracy={accuracy:.2%}  f1={f1:.3f}  run_id={run.info.run_id}")
+
+    print("\n" + "=" * 80)
+
+
 def promote_challenger_to_champion(auto_approve: bool = False):
     """
     Promote challenger to champion after approval
@@ -94,20 +205,18 @@ def promote_challenger_to_champion(auto_approve: bool = False):
     Args:
         auto_approve: Skip approval prompt (for automated workflows)
     """
+    from utils.mlflow_helpers import get_client
+
     print("=" * 80)
     print("OPTION 3: CHAMPION PROMOTION WORKFLOW")
     print("=" * 80)
 
-    # Load environment and setup MLflow
-    # Find project root and load .env file
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    env_path = os.path.join(project_root, "config", ".env")
-    load_dotenv(env_path)
-
-    mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "databricks"))
-    mlflow.set_registry_uri(os.getenv("MLFLOW_REGISTRY_URI", "databricks-uc"))
+    # Load environment and setup MLflow (no-op after the first call)
+    _init_mlflow_once()
 
-    client = MlflowClient()
+    # Shared client - one authenticated HTTP pool for all 6-10 registry
+    # calls the promotion path makes
+    client = get_client()
 
     # Get Unity Catalog configuration
     catalog = os.getenv("UC_CATALOG", "main")
@@ -119,9 +228,19 @@ def promote_challenger_to_champion(auto_approve: bool = False):
     print(f"\nModel: {full_model_name}")
     print(f"Auto-approve: {auto_approve}")
 
+    # The challenger and champion lookups are independent REST round-trips,
+    # so issue both concurrently and consume the results in display order
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        challenger_future = executor.submit(
+            get_model_by_alias, client, catalog, schema, model_name, "challenger"
+        )
+        champion_future = executor.submit(
+            get_model_by_alias, client, catalog, schema, model_name, "champion"
+        )
+
     # Step 1: Check if Challenger exists
     print("\n[1/5] Checking for challenger waiting for review...")
-    challenger_info = get_model_by_alias(client, catalog, schema, model_name, "challenger")
+    challenger_info = challenger_future.result()
 
     if challenger_info is None:
         print("\n⚠️  NO CHALLENGER FOUND")
@@ -140,7 +259,7 @@ def promote_challenger_to_champion(auto_approve: bool = False):
 
     # Step 2: Check current Champion
     print("\n[2/5] Checking current champion...")
-    champion_info = get_model_by_alias(client, catalog, schema, model_name, "champion")
+    champion_info = champion_future.result()
 
     if champion_info is None:
         print("ℹ️  No current champion found")
@@ -160,26 +279,37 @@ def promote_challenger_to_champion(auto_approve: bool = False):
 
     # Step 3: Show comparison
     print("\n[3/5] Performance Comparison...")
-    print("=" * 80)
 
-    if has_champion:
-        improvement = challenger_metrics['category_accuracy'] - champion_metrics['category_accuracy']
+    # The formatted table is for humans reviewing at a terminal; automated
+    # runs (the common Airflow path) get one structured JSON line instead,
+    # which log aggregators can parse without scraping a 15-line table
+    if sys.stdout.isatty() or not auto_approve:
+        print("=" * 80)
 
-        print(f"{'Metric':<20} {'Current Champion':>20} {'Challenger':>20} {'Improvement':>15}")
-        print("-" * 80)
-        print(f"{'Accuracy':<20} {champion_metrics['category_accuracy']:>19.2%} {challenger_metrics['category_accuracy']:>19.2%} {improvement:>14.2%}")
-        print(f"{'F1 Score':<20} {champion_metrics['category_f1']:>20.3f} {challenger_metrics['category_f1']:>20.3f}")
-        print(f"{'Provider/Model':<20} {champion_metrics['provider']:>20} {challenger_metrics['provider']:>20}")
-        print(f"{'Version':<20} {champion_metrics['version']:>20} {challenger_metrics['version']:>20}")
-    else:
-        print(f"{'Metric':<20} {'Challenger':>20}")
-        print("-" * 80)
-        print(f"{'Accuracy':<20} {challenger_metrics['category_accuracy']:>19.2%}")
-        print(f"{'F1 Score':<20} {challenger_metrics['category_f1']:>20.3f}")
-        print(f"{'Provider/Model':<20} {challenger_metrics['provider']:>20}")
-        print(f"{'Version':<20} {challenger_metrics['version']:>20}")
+        if has_champion:
+            improvement = challenger_metrics['category_accuracy'] - champion_metrics['category_accuracy']
+
+            print(f"{'Metric':<20} {'Current Champion':>20} {'Challenger':>20} {'Improvement':>15}")
+            print("-" * 80)
+            print(f"{'Accuracy':<20} {champion_metrics['category_accuracy']:>19.2%} {challenger_metrics['category_accuracy']:>19.2%} {improvement:>14.2%}")
+            print(f"{'F1 Score':<20} {champion_metrics['category_f1']:>20.3f} {challenger_metrics['category_f1']:>20.3f}")
+            print(f"{'Provider/Model':<20} {champion_metrics['provider']:>20} {challenger_metrics['provider']:>20}")
+            print(f"{'Version':<20} {champion_metrics['version']:>20} {challenger_metrics['version']:>20}")
+        else:
+            print(f"{'Metric':<20} {'Challenger':>20}")
+            print("-" * 80)
+            print(f"{'Accuracy':<20} {challenger_metrics['category_accuracy']:>19.2%}")
+            print(f"{'F1 Score':<20} {challenger_metrics['category_f1']:>20.3f}")
+            print(f"{'Provider/Model':<20} {challenger_metrics['provider']:>20}")
+            print(f"{'Version':<20} {challenger_metrics['version']:>20}")
 
-    print("=" * 80)
+        print("=" * 80)
+    else:
+        print(json.dumps({
+            "event": "promotion_comparison",
+            "challenger": challenger_metrics,
+            "champion": champion_metrics if has_champion else None,
+        }))
 
     # Step 4: Request approval (unless auto-approve)
     print("\n[4/5] Approval Gate...")
@@ -188,6 +318,13 @@ def promote_challenger_to_champion(auto_approve: bool = False):
         print("✓ Auto-approve enabled - proceeding with promotion")
         approved = True
     else:
+        # Without a TTY, input() below would block forever on closed stdin
+        # (a hung task in container orchestration) - fail fast instead
+        if not sys.stdin.isatty():
+            raise RuntimeError(
+                "stdin is not a TTY - re-run with --auto-approve for non-interactive promotion"
+            )
+
         print("\n🤔 Promote challenger to champion?")
 
         if has_champion:
@@ -209,13 +346,18 @@ def promote_challenger_to_champion(auto_approve: bool = False):
     print("\n[5/5] Executing promotion...")
 
     try:
-        # 5a. Demote current champion to defeated (if exists)
+        # 5a. Demote current champion to defeated (if exists). Defeated is a
+        # historical state, not a serving pointer, so record it as a status
+        # tag rather than an alias - a tag write is a single cheap call with
+        # none of the registry's alias bookkeeping, and aliases stay reserved
+        # for the pointers production actually loads (champion/challenger)
         if has_champion:
             print(f"   • Demoting champion v{champion_metrics['version']} → defeated...")
-            client.set_registered_model_alias(
+            client.set_model_version_tag(
                 name=full_model_name,
-                alias="defeated",
-                version=champion_metrics['version']
+                version=champion_metrics['version'],
+                key="status",
+                value="defeated"
             )
             print(f"   ✓ Version {champion_metrics['version']} is now defeated")
 
@@ -228,32 +370,50 @@ def promote_challenger_to_champion(auto_approve: bool = False):
         )
         print(f"   ✓ Version {challenger_metrics['version']} is now champion")
 
-        # 5c. Remove challenger alias (no longer needed)
-        print(f"   • Removing 'challenger' alias from v{challenger_metrics['version']}...")
-        client.delete_registered_model_alias(
-            name=full_model_name,
-            alias="challenger"
-        )
-        print(f"   ✓ Removed 'challenger' alias")
+        # 5c/5d. The remaining bookkeeping calls (dropping the challenger
+        # alias and the two description updates) are independent of each
+        # other once the aliases above are set, so pipeline them instead of
+        # paying a serial round-trip each
+        print(f"   • Removing 'challenger' alias and updating descriptions...")
 
-        # 5d. Update model version description
         new_description = f"🏆 CHAMPION - Promoted from Challenger"
         if has_champion:
             new_description += f" (replaced v{champion_metrics['version']})"
 
-        client.update_model_version(
-            name=full_model_name,
-            version=challenger_metrics['version'],
-            description=new_description
-        )
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            cleanup_futures = [
+                executor.submit(
+                    client.delete_registered_model_alias,
+                    name=full_model_name,
+                    alias="challenger"
+                ),
+                executor.submit(
+                    client.update_model_version,
+                    name=full_model_name,
+                    version=challenger_metrics['version'],
+                    description=new_description
+                ),
+                executor.submit(
+                    client.set_model_version_tag,
+                    name=full_model_name,
+                    version=challenger_metrics['version'],
+                    key="status",
+                    value="champion"
+                ),
+            ]
+            if has_champion:
+                cleanup_futures.append(executor.submit(
+                    client.update_model_version,
+                    name=full_model_name,
+                    version=champion_metrics['version'],
+                    description=f"⚔️ DEFEATED - Replaced by v{challenger_metrics['version']}"
+                ))
+
+            # Surface the first failure, if any
+            for future in cleanup_futures:
+                future.result()
 
-        if has_champion:
-            defeated_description = f"⚔️ DEFEATED - Replaced by v{challenger_metrics['version']}"
-            client.update_model_version(
-                name=full_model_name,
-                version=champion_metrics['version'],
-                description=defeated_description
-            )
+        print(f"   ✓ Removed 'challenger' alias")
 
         # Success summary
         print("\n" + "=" * 80)
@@ -273,6 +433,10 @@ def promote_challenger_to_champion(auto_approve: bool = False):
 
         print(f"\nTo load new champion in production:")
         print(f"  model = mlflow.pyfunc.load_model('models:/{full_model_name}@champion')")
+        print(f"\nPinned (immutable) URI for reproducible loads:")
+        print(f"  model = mlflow.pyfunc.load_model('models:/{full_model_name}/{challenger_metrics['version']}')")
+        print(f"\nTo list defeated versions (status is a tag, not an alias):")
+        print(f"  client.search_model_versions(\"name='{full_model_name}' and tag.status='defeated'\")")
         print("=" * 80)
 
     except Exception as e:
@@ -291,7 +455,15 @@ if __name__ == "__main__":
         action="store_true",
         help="Skip approval prompt and auto-approve promotion (for automated workflows)"
     )
+    parser.add_argument(
+        "--list-candidates",
+        action="store_true",
+        help="List candidate runs from both experiments (best first) and exit"
+    )
 
     args = parser.parse_args()
 
-    promote_challenger_to_champion(auto_approve=args.auto_approve)
+    if args.list_candidates:
+        list_candidate_models()
+    else:
+        promote_challenger_to_champion(auto_approve=args.auto_approve)
@@ -3,21 +3,59 @@ Internal Databricks Foundation Model Agent for News Classification
 Uses Databricks-hosted models (DBRX, Llama-3) via Foundation Model APIs
 """
 
+import asyncio
 import os
+import re
 from typing import Dict, Optional
 import sys
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports (guarded - duplicate entries
+# lengthen every subsequent import search)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 
 from config.news_categories import (
     NEWS_CATEGORIES,
     SENTIMENT_CATEGORIES,
-    COMBINED_PROMPT_TEMPLATE
+    render_combined
 )
 from utils.databricks_auth import get_databricks_client
+from utils.prompt_cache import PromptCache
+
+# Precompiled response parsing: one pass over the response plus O(1) dict
+# lookups instead of a per-line nested scan over every label
+_KV_RE = re.compile(r'^\s*(category|sentiment)\s*:\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+_CATEGORY_LOWER = {c.lower(): c for c in NEWS_CATEGORIES}
+_SENTIMENT_LOWER = {s.lower(): s for s in SENTIMENT_CATEGORIES}
+
+
+def _extract_text(node) -> str:
+    """
+    Flatten a serving-endpoint content payload into plain text
+
+    Reasoning models return nested list/dict structures ('text' chunks,
+    'summary' wrappers); plain chat models return a string. One small
+    recursion covers every shape the old branch ladder handled.
+
+    Args:
+        node: Response content node (str, dict, list, or other)
+
+    Returns:
+        str: Concatenated text content
+    """
+    if isinstance(node, str):
+        return node
+    if isinstance(node, dict):
+        for key in ('text', 'summary'):
+            if key in node:
+                return _extract_text(node[key])
+        return str(node)
+    if isinstance(node, list):
+        return ''.join(_extract_text(item) for item in node)
+    return str(node)
 
 
 class InternalNewsClassifierAgent:
@@ -27,12 +65,16 @@ class InternalNewsClassifierAgent:
 
     def __init__(
         self,
-        model: str = "databricks-gpt-oss-20b"
+        model: str = "databricks-gpt-oss-20b",
+        cache: Optional[PromptCache] = None
     ):
         """
         Initialize internal agent
 
         Args:
+            cache: Optional prompt/response cache; identical prompts answer
+                   from the cache instead of the serving endpoint (the agent
+                   queries with temperature=0, so responses are deterministic)
             model: Foundation model endpoint name
 
                    OpenAI models via Databricks:
@@ -70,6 +112,12 @@ class InternalNewsClassifierAgent:
         """
         self.model = model
         self.client = get_databricks_client()
+        self.cache = cache
+        # Constant over the agent's lifetime - build once instead of per call
+        self._system_msg = ChatMessage(
+            role=ChatMessageRole.SYSTEM,
+            content="You are a news classification expert."
+        )
 
     def classify(self, title: str, content: str) -> Dict[str, str]:
         """
@@ -82,20 +130,60 @@ class InternalNewsClassifierAgent:
         Returns:
             Dict with 'category', 'sentiment', and 'raw_response'
         """
-        # Build prompt
-        prompt = COMBINED_PROMPT_TEMPLATE.format(
-            categories=", ".join(NEWS_CATEGORIES),
-            sentiments=", ".join(SENTIMENT_CATEGORIES),
-            title=title,
-            content=content
-        )
+        # Build prompt (categories/sentiments are baked into the template)
+        prompt = render_combined(title, content)
+
+        # Identical prompts answer from the cache instead of the endpoint
+        cache_key = None
+        if self.cache is not None:
+            cache_key = PromptCache.make_key("databricks", self.model, prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._parse_response(cached)
 
         # Call Databricks Foundation Model API
         response = self._call_foundation_model(prompt)
 
+        if cache_key is not None:
+            self.cache.put(cache_key, "databricks", self.model, prompt, response)
+
         # Parse response
         return self._parse_response(response)
 
+    async def aclassify(self, title: str, content: str) -> Dict[str, str]:
+        """
+        Async variant of classify for concurrent batch classification
+
+        `WorkspaceClient.serving_endpoints.query` is synchronous, so the
+        blocking call is pushed to a worker thread with `asyncio.to_thread`;
+        many in-flight requests can then share one event loop and batch wall
+        time is bounded by the slowest response instead of the sum of them.
+
+        Args:
+            title: Article title
+            content: Article content
+
+        Returns:
+            Dict with 'category', 'sentiment', and 'raw_response'
+        """
+        prompt = render_combined(title, content)
+
+        # The cache is a local SQLite lookup on the loop thread - cheap
+        # enough to stay synchronous even inside the async path
+        cache_key = None
+        if self.cache is not None:
+            cache_key = PromptCache.make_key("databricks", self.model, prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._parse_response(cached)
+
+        response = await asyncio.to_thread(self._call_foundation_model, prompt)
+
+        if cache_key is not None:
+            self.cache.put(cache_key, "databricks", self.model, prompt, response)
+
+        return self._parse_response(response)
+
     def _call_foundation_model(self, prompt: str) -> str:
         """
         Call Databricks Foundation Model API
@@ -109,10 +197,7 @@ class InternalNewsClassifierAgent:
         try:
             # Create chat message
             messages = [
-                ChatMessage(
-                    role=ChatMessageRole.SYSTEM,
-                    content="You are a news classification expert."
-                ),
+                self._system_msg,
                 ChatMessage(
                     role=ChatMessageRole.USER,
                     content=prompt
@@ -127,60 +212,9 @@ class InternalNewsClassifierAgent:
                 max_tokens=300  # Increased for reasoning models that explain first
             )
 
-            # Extract response text
+            # Extract response text (flattens reasoning-model structures)
             if response.choices and len(response.choices) > 0:
-                content = response.choices[0].message.content
-
-                # Handle different response formats
-                if isinstance(content, list):
-                    # List of content chunks
-                    text_parts = []
-                    for item in content:
-                        if isinstance(item, dict):
-                            # Structured response (e.g., reasoning models)
-                            if 'text' in item:
-                                text_parts.append(str(item['text']))
-                            elif 'summary' in item:
-                                # Extract from summary field
-                                summary = item['summary']
-                                if isinstance(summary, list):
-                                    for summary_item in summary:
-                                        if isinstance(summary_item, dict) and 'text' in summary_item:
-                                            text_parts.append(str(summary_item['text']))
-                                        else:
-                                            text_parts.append(str(summary_item))
-                                else:
-                                    text_parts.append(str(summary))
-                            else:
-                                text_parts.append(str(item))
-                        else:
-                            text_parts.append(str(item))
-                    content = ''.join(text_parts)
-                elif isinstance(content, dict):
-                    # Single dict response (reasoning models)
-                    if 'text' in content:
-                        content = str(content['text'])
-                    elif 'summary' in content:
-                        summary = content['summary']
-                        if isinstance(summary, list):
-                            text_parts = []
-                            for item in summary:
-                                if isinstance(item, dict) and 'text' in item:
-                                    text_parts.append(str(item['text']))
-                                else:
-                                    text_parts.append(str(item))
-                            content = ''.join(text_parts)
-                        else:
-                            content = str(summary)
-                    else:
-                        content = str(content)
-                elif isinstance(content, str):
-                    # Already a string
-                    pass
-                else:
-                    content = str(content)
-
-                return content.strip()
+                return _extract_text(response.choices[0].message.content).strip()
             else:
                 raise Exception("No response from model")
 
@@ -204,34 +238,24 @@ class InternalNewsClassifierAgent:
         }
 
         # Parse response (format: "Category: X\nSentiment: Y")
-        lines = response.strip().split("\n")
-        for line in lines:
-            if ":" in line:
-                key, value = line.split(":", 1)
-                key = key.strip().lower()
-                value = value.strip()
-
-                if "category" in key:
-                    # Validate against known categories
-                    if value in NEWS_CATEGORIES:
-                        result["category"] = value
-                    else:
-                        # Try to find closest match
-                        for cat in NEWS_CATEGORIES:
-                            if cat.lower() in value.lower():
-                                result["category"] = cat
-                                break
-
-                elif "sentiment" in key:
-                    # Validate against known sentiments
-                    if value in SENTIMENT_CATEGORIES:
-                        result["sentiment"] = value
-                    else:
-                        # Try to find closest match
-                        for sent in SENTIMENT_CATEGORIES:
-                            if sent.lower() in value.lower():
-                                result["sentiment"] = sent
-                                break
+        for match in _KV_RE.finditer(response):
+            key = match.group(1).lower()
+            value = match.group(2)
+            lookup = _CATEGORY_LOWER if key == "category" else _SENTIMENT_LOWER
+
+            # Exact (case-insensitive) match is O(1); fall back to a
+            # substring scan only when the model wrapped the label in
+            # extra words
+            canonical = lookup.get(value.lower())
+            if canonical is None:
+                value_lower = value.lower()
+                canonical = next(
+                    (label for lowered, label in lookup.items() if lowered in value_lower),
+                    None
+                )
+
+            if canonical is not None:
+                result[key] = canonical
 
         return result
 
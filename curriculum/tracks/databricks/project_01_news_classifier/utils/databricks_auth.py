@@ -2,15 +2,28 @@
 Databricks authentication and secret management utilities
 """
 
+import hashlib
 import os
+import time
+from functools import lru_cache
 from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from databricks.sdk import WorkspaceClient
 
 
+@lru_cache(maxsize=1)
 def get_databricks_client() -> WorkspaceClient:
     """
     Initialize Databricks workspace client using environment variables
 
+    The client is cached at module scope so every agent and helper shares
+    one authenticated client and its keep-alive connection pool instead of
+    re-authenticating per call. The pool is widened to 32 connections so
+    concurrent serving-endpoint requests reuse warm TLS connections rather
+    than paying a handshake each.
+
     Returns:
         WorkspaceClient: Authenticated Databricks client
     """
@@ -22,7 +35,21 @@ def get_databricks_client() -> WorkspaceClient:
             "DATABRICKS_HOST and DATABRICKS_TOKEN must be set in environment variables"
         )
 
-    return WorkspaceClient(host=host, token=token)
+    client = WorkspaceClient(host=host, token=token)
+
+    # Widen the SDK's underlying requests.Session pool (best-effort: the
+    # session attribute is SDK-internal, so skip quietly if it moves)
+    session = getattr(client.api_client, "_session", None)
+    if isinstance(session, requests.Session):
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    return client
 
 
 def get_databricks_secret(scope: str, key: str) -> str:
@@ -55,18 +82,48 @@ def get_databricks_secret(scope: str, key: str) -> str:
         return value
 
 
+# Short-lived cross-process marker so sweeps launching many experiments
+# don't each pay the current_user.me() round-trip just to re-verify the
+# same credentials
+_AUTH_CACHE_DIR = os.path.expanduser("~/.cache/databricks_auth")
+_AUTH_CACHE_TTL_SECONDS = 300
+
+
+@lru_cache(maxsize=1)
 def verify_databricks_connection() -> bool:
     """
     Verify that Databricks connection is working
 
+    The result is cached for the process lifetime, and a successful probe
+    leaves a token-hash marker file honored for 5 minutes by other
+    processes, so repeated invocations skip the verification round-trip.
+
     Returns:
         bool: True if connection is successful
     """
+    host = os.getenv("DATABRICKS_HOST", "")
+    token = os.getenv("DATABRICKS_TOKEN", "")
+
+    marker = None
+    if host and token:
+        token_hash = hashlib.blake2b((host + token).encode(), digest_size=8).hexdigest()
+        marker = os.path.join(_AUTH_CACHE_DIR, token_hash)
+        try:
+            if time.time() - os.path.getmtime(marker) < _AUTH_CACHE_TTL_SECONDS:
+                print("✓ Databricks credentials recently verified (cached)")
+                return True
+        except OSError:
+            pass  # No marker yet - fall through to the live probe
+
     try:
         client = get_databricks_client()
         # Try to get current user as a simple connectivity test
         user = client.current_user.me()
         print(f"✓ Successfully connected to Databricks as: {user.user_name}")
+        if marker is not None:
+            os.makedirs(_AUTH_CACHE_DIR, exist_ok=True)
+            with open(marker, 'w'):
+                pass
         return True
     except Exception as e:
         print(f"✗ Failed to connect to Databricks: {e}")
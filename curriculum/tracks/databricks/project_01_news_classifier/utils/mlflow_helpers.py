@@ -3,11 +3,61 @@ MLflow utilities for experiment tracking and model registration
 """
 
 import os
-import json
-from typing import Dict, List, Any, Optional
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, List, Any, Optional
 import mlflow
+from mlflow.entities import Metric, Param
+import numpy as np
 import pandas as pd
-from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix
+
+# Process-wide client singleton (see get_client)
+_CLIENT: Optional["mlflow.tracking.MlflowClient"] = None
+
+
+def get_client() -> "mlflow.tracking.MlflowClient":
+    """
+    Return a process-wide MlflowClient singleton
+
+    Each MlflowClient owns its own authenticated HTTP connection pool, so
+    sharing a single instance across a script amortizes TLS/TCP setup over
+    all registry and tracking calls instead of paying it per call site.
+    The pool is widened and retries enabled before the first client is
+    built so concurrent callers (thread pools) don't serialize on sockets.
+
+    Returns:
+        MlflowClient: Shared client instance
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        # Tune MLflow's underlying urllib3 pool for concurrent callers and
+        # retry transient HTTP failures with backoff
+        os.environ.setdefault("MLFLOW_HTTP_POOL_CONNECTIONS", "32")
+        os.environ.setdefault("MLFLOW_HTTP_POOL_MAXSIZE", "64")
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_MAX_RETRIES", "5")
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_BACKOFF_FACTOR", "0.2")
+        _CLIENT = mlflow.tracking.MlflowClient()
+    return _CLIENT
+
+
+@lru_cache(maxsize=64)
+def _get_experiment_by_name(experiment_name: str) -> Optional[Any]:
+    """
+    Resolve an experiment by name once per process
+
+    Experiment name→entity mappings don't change mid-run, so repeated
+    setup_mlflow calls (sweeps re-using one interpreter) answer from the
+    cache instead of re-querying the tracking server.
+
+    Args:
+        experiment_name: Experiment name to resolve
+
+    Returns:
+        Experiment entity, or None if it does not exist
+    """
+    return mlflow.get_experiment_by_name(experiment_name)
 
 
 def setup_mlflow(experiment_name: str) -> str:
@@ -37,7 +87,7 @@ def setup_mlflow(experiment_name: str) -> str:
         else:
             # Run exists but not active yet - get its experiment ID
             run_id = os.getenv("MLFLOW_RUN_ID")
-            client = mlflow.tracking.MlflowClient()
+            client = get_client()
             run = client.get_run(run_id)
             experiment_id = run.info.experiment_id
             experiment = mlflow.get_experiment(experiment_id)
@@ -46,9 +96,11 @@ def setup_mlflow(experiment_name: str) -> str:
 
     # No mlflow run context - create or get experiment normally (for direct Python execution)
     try:
-        experiment = mlflow.get_experiment_by_name(experiment_name)
+        experiment = _get_experiment_by_name(experiment_name)
         if experiment is None:
             experiment_id = mlflow.create_experiment(experiment_name)
+            # The cached None is stale now that the experiment exists
+            _get_experiment_by_name.cache_clear()
             print(f"✓ Created new experiment: {experiment_name} (ID: {experiment_id})")
         else:
             experiment_id = experiment.experiment_id
@@ -61,88 +113,248 @@ def setup_mlflow(experiment_name: str) -> str:
         raise Exception(f"Failed to setup MLflow experiment: {e}")
 
 
+def iter_model_versions(
+    client: "mlflow.tracking.MlflowClient",
+    model_name: str,
+    page_size: int = 200
+) -> Iterator[Any]:
+    """
+    Iterate over all versions of a registered model with explicit pagination
+
+    A bare search_model_versions() call silently caps results at the backend
+    default, which can miss versions for models with many registrations.
+    Driving the page_token cursor explicitly keeps per-call latency and
+    memory bounded while guaranteeing every version is returned.
+
+    Args:
+        client: MlflowClient instance
+        model_name: Full model name (e.g., catalog.schema.model)
+        page_size: Max versions to fetch per REST call
+
+    Yields:
+        ModelVersion entities, one page at a time
+    """
+    page_token = None
+    while True:
+        page = client.search_model_versions(
+            f"name='{model_name}'",
+            max_results=page_size,
+            page_token=page_token
+        )
+        yield from page
+        page_token = getattr(page, 'token', None)
+        if not page_token:
+            break
+
+
+def iter_experiment_runs(
+    client: "mlflow.tracking.MlflowClient",
+    experiment_id: str,
+    page_size: int = 1000
+) -> Iterator[Any]:
+    """
+    Iterate over all runs in an experiment with explicit pagination
+
+    Streams runs page by page instead of materializing the full (silently
+    capped) result of search_runs, keeping memory constant for experiments
+    with thousands of runs and letting consumers start work before the
+    listing finishes.
+
+    Args:
+        client: MlflowClient instance
+        experiment_id: Experiment ID to list runs from
+        page_size: Max runs to fetch per REST call
+
+    Yields:
+        Run entities, one page at a time
+    """
+    page_token = None
+    while True:
+        page = client.search_runs(
+            [experiment_id],
+            max_results=page_size,
+            page_token=page_token
+        )
+        yield from page
+        page_token = getattr(page, 'token', None)
+        if not page_token:
+            break
+
+
 def log_predictions(
     predictions: List[Dict[str, Any]],
-    artifact_path: str = "predictions"
+    artifact_path: str = "predictions",
+    include_json: bool = False
 ) -> None:
     """
     Log predictions as MLflow artifact
 
+    Streamed to zstd-compressed Parquet in chunks of 50k rows, so peak
+    memory is O(chunk) instead of the ~2-3x payload spike a full
+    DataFrame materialization costs. Pass include_json=True for an
+    additional orjson-serialized copy when a plain-text artifact is
+    wanted.
+
     Args:
         predictions: List of prediction dictionaries
         artifact_path: Path to store artifact
+        include_json: Also log a JSON copy of the predictions
     """
-    df = pd.DataFrame(predictions)
-
-    # Log as CSV
-    csv_path = f"{artifact_path}.csv"
-    df.to_csv(csv_path, index=False)
-    mlflow.log_artifact(csv_path, artifact_path="predictions")
-
-    # Log as JSON for easy parsing
-    json_path = f"{artifact_path}.json"
-    with open(json_path, 'w') as f:
-        json.dump(predictions, f, indent=2)
-    mlflow.log_artifact(json_path, artifact_path="predictions")
-
-    # Clean up local files
-    os.remove(csv_path)
-    os.remove(json_path)
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    chunk_size = 50_000
+
+    # Temp dir cleans up even when the upload raises
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parquet_path = os.path.join(tmp_dir, f"{artifact_path}.parquet")
+        writer = None
+        try:
+            for start in range(0, len(predictions), chunk_size):
+                table = pa.Table.from_pylist(predictions[start:start + chunk_size])
+                if writer is None:
+                    # Schema comes from the first chunk; one writer handles
+                    # the whole file so row groups share metadata
+                    writer = pq.ParquetWriter(parquet_path, table.schema, compression="zstd")
+                writer.write_table(table)
+            if writer is None:
+                # Empty batch - still produce a valid (schemaless) file
+                writer = pq.ParquetWriter(parquet_path, pa.schema([]), compression="zstd")
+        finally:
+            if writer is not None:
+                writer.close()
+        mlflow.log_artifact(parquet_path, artifact_path="predictions")
+
+        if include_json:
+            import orjson
+
+            json_path = os.path.join(tmp_dir, f"{artifact_path}.json")
+            with open(json_path, 'wb') as f:
+                # OPT_SERIALIZE_NUMPY lets numpy scalars in prediction
+                # dicts serialize without a Python-level conversion pass
+                f.write(orjson.dumps(predictions, option=orjson.OPT_SERIALIZE_NUMPY))
+            mlflow.log_artifact(json_path, artifact_path="predictions")
 
     print(f"✓ Logged {len(predictions)} predictions to MLflow")
 
 
 def calculate_metrics(
-    y_true: List[str],
-    y_pred: List[str],
-    labels: Optional[List[str]] = None
+    y_true: List[Any],
+    y_pred: List[Any],
+    labels: Optional[List[Any]] = None,
+    label_names: Optional[List[str]] = None
 ) -> Dict[str, float]:
     """
     Calculate classification metrics
 
+    Labels may be strings or integer codes; integer-encoded arrays skip
+    sklearn's per-element string hashing. Pass label_names alongside
+    integer labels to keep per-class metric keys human-readable.
+
     Args:
         y_true: True labels
         y_pred: Predicted labels
-        labels: List of label names (optional)
+        labels: List of label values (optional)
+        label_names: Display names for labels (defaults to labels)
 
     Returns:
         Dict[str, float]: Metrics dictionary
     """
-    # Calculate basic accuracy
-    accuracy = accuracy_score(y_true, y_pred)
-
-    # Calculate precision, recall, f1
-    precision, recall, f1, support = precision_recall_fscore_support(
-        y_true, y_pred, average='weighted', zero_division=0
+    if label_names is None:
+        label_names = labels
+
+    label_list = list(labels) if labels else sorted(set(y_true) | set(y_pred))
+    num_labels = len(label_list)
+
+    # pd.Categorical encodes labels to int codes in one C-level pass
+    # (unknown labels become -1), replacing N Python dict lookups
+    yt = pd.Categorical(y_true, categories=label_list).codes.astype(np.int64, copy=False)
+    yp = pd.Categorical(y_pred, categories=label_list).codes.astype(np.int64, copy=False)
+
+    # One fused bincount builds the confusion matrix; every other metric
+    # falls out of its sums instead of sklearn re-walking the label
+    # arrays per averaging mode. Out-of-vocabulary entries (e.g.
+    # 'Unknown' predictions) can't land in the matrix, but they still
+    # count against accuracy below and against recall via support.
+    valid = (yt >= 0) & (yp >= 0)
+    cm = np.bincount(
+        num_labels * yt[valid] + yp[valid],
+        minlength=num_labels * num_labels
+    ).reshape(num_labels, num_labels)
+
+    tp = np.diag(cm).astype(np.float64)
+    # Support comes from the true labels, not the matrix rows: a sample
+    # whose prediction fell outside the vocabulary still belongs in its
+    # class's recall denominator (sklearn's behavior under labels=)
+    support = np.bincount(yt[yt >= 0], minlength=num_labels).astype(np.float64)
+    predicted = cm.sum(axis=0).astype(np.float64)  # predicted counts per class
+
+    # zero_division=0 semantics: empty rows/columns score 0
+    precision_per_class = tp / np.maximum(predicted, 1)
+    recall_per_class = tp / np.maximum(support, 1)
+    f1_per_class = (
+        2 * precision_per_class * recall_per_class
+        / np.maximum(precision_per_class + recall_per_class, 1e-12)
     )
 
-    # Calculate per-class metrics
-    precision_per_class, recall_per_class, f1_per_class, _ = precision_recall_fscore_support(
-        y_true, y_pred, average=None, labels=labels, zero_division=0
+    total_support = max(support.sum(), 1.0)
+    accuracy = (
+        float(np.mean(np.asarray(y_true) == np.asarray(y_pred)))
+        if len(y_true) else 0.0
     )
 
     metrics = {
-        "accuracy": float(accuracy),
-        "precision_weighted": float(precision),
-        "recall_weighted": float(recall),
-        "f1_weighted": float(f1),
+        "accuracy": accuracy,
+        "precision_weighted": float((precision_per_class * support).sum() / total_support),
+        "recall_weighted": float((recall_per_class * support).sum() / total_support),
+        "f1_weighted": float((f1_per_class * support).sum() / total_support),
     }
 
     # Add per-class metrics
     if labels:
-        for i, label in enumerate(labels):
-            if i < len(precision_per_class):
-                metrics[f"precision_{label}"] = float(precision_per_class[i])
-                metrics[f"recall_{label}"] = float(recall_per_class[i])
-                metrics[f"f1_{label}"] = float(f1_per_class[i])
+        for i, label in enumerate(label_names):
+            metrics[f"precision_{label}"] = float(precision_per_class[i])
+            metrics[f"recall_{label}"] = float(recall_per_class[i])
+            metrics[f"f1_{label}"] = float(f1_per_class[i])
 
     return metrics
 
 
+def fast_confusion_matrix(
+    y_true: "np.ndarray",
+    y_pred: "np.ndarray",
+    num_labels: int
+) -> "np.ndarray":
+    """
+    Build a confusion matrix from integer-encoded labels in one NumPy op
+
+    sklearn's confusion_matrix rebuilds a label→index mapping and runs a
+    Python-level indexing pass per call; with labels already encoded as
+    integer codes a single fused np.add.at scatter does the same count.
+    Entries with negative codes (missing/unknown) are dropped.
+
+    Args:
+        y_true: Integer-encoded true labels
+        y_pred: Integer-encoded predicted labels
+        num_labels: Number of valid labels (matrix is num_labels²)
+
+    Returns:
+        np.ndarray: num_labels x num_labels count matrix
+    """
+    y_true = np.asarray(y_true, dtype=np.intp)
+    y_pred = np.asarray(y_pred, dtype=np.intp)
+
+    valid = (y_true >= 0) & (y_pred >= 0)
+    cm = np.zeros((num_labels, num_labels), dtype=np.int32)
+    np.add.at(cm, (y_true[valid], y_pred[valid]), 1)
+    return cm
+
+
 def log_confusion_matrix(
-    y_true: List[str],
-    y_pred: List[str],
-    labels: List[str]
+    y_true: List[Any],
+    y_pred: List[Any],
+    labels: List[Any],
+    label_names: Optional[List[str]] = None
 ) -> None:
     """
     Log confusion matrix as artifact
@@ -150,18 +362,48 @@ def log_confusion_matrix(
     Args:
         y_true: True labels
         y_pred: Predicted labels
-        labels: List of label names
+        labels: List of label values (strings or integer codes)
+        label_names: Display names for rows/columns (defaults to labels)
     """
-    cm = confusion_matrix(y_true, y_pred, labels=labels)
+    if label_names is None:
+        label_names = labels
+
+    # Integer-encoded inputs take the fused NumPy path directly; string
+    # labels are encoded to codes in one C-level Categorical pass first
+    y_true_arr = np.asarray(y_true)
+    if y_true_arr.size and np.issubdtype(y_true_arr.dtype, np.integer):
+        cm = fast_confusion_matrix(y_true_arr, np.asarray(y_pred), len(labels))
+    else:
+        codes_true = pd.Categorical(y_true, categories=labels).codes
+        codes_pred = pd.Categorical(y_pred, categories=labels).codes
+        cm = fast_confusion_matrix(codes_true, codes_pred, len(labels))
 
     # Create confusion matrix DataFrame
-    cm_df = pd.DataFrame(cm, index=labels, columns=labels)
-
-    # Save and log
-    cm_path = "confusion_matrix.csv"
-    cm_df.to_csv(cm_path)
-    mlflow.log_artifact(cm_path, artifact_path="metrics")
-    os.remove(cm_path)
+    cm_df = pd.DataFrame(cm, index=label_names, columns=label_names)
+
+    # Parquet+zstd: a fraction of the CSV bytes over the wire, and the
+    # columnar writer skips pandas' per-cell string formatting
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cm_path = os.path.join(tmp_dir, "confusion_matrix.parquet")
+        cm_df.to_parquet(cm_path, compression="zstd")
+        mlflow.log_artifact(cm_path, artifact_path="metrics")
+
+        # Small markdown sidecar keeps the matrix human-readable in the UI.
+        # Rendered by hand: DataFrame.to_markdown needs the optional
+        # tabulate package, which isn't in the project dependencies
+        names = [str(n) for n in label_names]
+        lines = [
+            "| |" + "|".join(names) + "|",
+            "|---" * (len(names) + 1) + "|",
+        ]
+        lines += [
+            "|" + name + "|" + "|".join(str(int(v)) for v in row) + "|"
+            for name, row in zip(names, cm)
+        ]
+        md_path = os.path.join(tmp_dir, "confusion_matrix.md")
+        with open(md_path, 'w') as f:
+            f.write("\n".join(lines))
+        mlflow.log_artifact(md_path, artifact_path="metrics")
 
     print("✓ Logged confusion matrix to MLflow")
 
@@ -194,6 +436,12 @@ def register_model_to_uc(
     full_model_name = f"{catalog}.{schema}.{model_name}"
 
     try:
+        # Mirror a short description onto the version tags in the same
+        # registration request - the version then self-describes without
+        # costing an extra round-trip
+        if description:
+            tags = {**(tags or {}), "description": description[:250]}
+
         # Register model
         model_uri = f"runs:/{run_id}/model"
         model_version = mlflow.register_model(
@@ -202,22 +450,44 @@ def register_model_to_uc(
             tags=tags
         )
 
-        client = mlflow.tracking.MlflowClient()
+        client = get_client()
 
-        # Update model description if provided
+        # Record the immutable URI on the version so downstream consumers
+        # can pin exactly what they loaded instead of chasing a moving alias
+        pinned_uri = f"models:/{full_model_name}/{model_version.version}"
         if description:
-            client.update_registered_model(
+            description = f"{description} | pinned: {pinned_uri}"
+
+        # The pinned-URI tag, description update and alias assignment are
+        # independent of each other once the version exists, so issue them
+        # concurrently - one round-trip of latency instead of three
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(
+                client.set_model_version_tag,
                 name=full_model_name,
-                description=description
-            )
+                version=model_version.version,
+                key="pinned_uri",
+                value=pinned_uri
+            )]
+            if description:
+                futures.append(executor.submit(
+                    client.update_registered_model,
+                    name=full_model_name,
+                    description=description
+                ))
+            if alias:
+                futures.append(executor.submit(
+                    client.set_registered_model_alias,
+                    name=full_model_name,
+                    alias=alias,
+                    version=model_version.version
+                ))
+
+            # Surface the first failure, if any
+            for future in futures:
+                future.result()
 
-        # Set alias if provided
         if alias:
-            client.set_registered_model_alias(
-                name=full_model_name,
-                alias=alias,
-                version=model_version.version
-            )
             print(f"✓ Registered model: {full_model_name} (version {model_version.version}, alias: {alias})")
         else:
             print(f"✓ Registered model: {full_model_name} (version {model_version.version})")
@@ -229,28 +499,45 @@ def register_model_to_uc(
         raise
 
 
+# log_batch request limits enforced by the tracking API
+_MAX_PARAMS_PER_BATCH = 100
+_MAX_METRICS_PER_BATCH = 1000
+
+
 def log_model_parameters(params: Dict[str, Any]) -> None:
     """
-    Log model parameters to MLflow
+    Log model parameters to MLflow in one batched call
+
+    One log_batch request replaces a REST round-trip (and, on database
+    backends, a transaction) per parameter.
 
     Args:
         params: Dictionary of parameters
     """
-    for key, value in params.items():
-        # MLflow params must be strings
-        mlflow.log_param(key, str(value))
+    run_id = mlflow.active_run().info.run_id
+    client = get_client()
+
+    # MLflow params must be strings
+    entries = [Param(key, str(value)) for key, value in params.items()]
+    for start in range(0, len(entries), _MAX_PARAMS_PER_BATCH):
+        client.log_batch(run_id=run_id, params=entries[start:start + _MAX_PARAMS_PER_BATCH])
 
     print(f"✓ Logged {len(params)} parameters to MLflow")
 
 
 def log_model_metrics(metrics: Dict[str, float]) -> None:
     """
-    Log metrics to MLflow
+    Log metrics to MLflow in one batched call
 
     Args:
         metrics: Dictionary of metrics
     """
-    for key, value in metrics.items():
-        mlflow.log_metric(key, value)
+    run_id = mlflow.active_run().info.run_id
+    client = get_client()
+
+    timestamp = int(time.time() * 1000)
+    entries = [Metric(key, float(value), timestamp, 0) for key, value in metrics.items()]
+    for start in range(0, len(entries), _MAX_METRICS_PER_BATCH):
+        client.log_batch(run_id=run_id, metrics=entries[start:start + _MAX_METRICS_PER_BATCH])
 
     print(f"✓ Logged {len(metrics)} metrics to MLflow")
\ No newline at end of file
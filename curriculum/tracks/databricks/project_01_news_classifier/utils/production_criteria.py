@@ -3,10 +3,14 @@ Production Model Registration Criteria
 Defines validation gates for promoting models to production registry
 """
 
-from typing import Dict, Tuple, Optional, Any
+import time
+from typing import Dict, Tuple, Optional, Any, Union
 from dataclasses import dataclass
+from functools import lru_cache
 import mlflow
 
+from utils.mlflow_helpers import get_client
+
 
 @dataclass
 class ProductionCriteria:
@@ -30,47 +34,84 @@ class ProductionCriteria:
     min_cost_savings: float = 0.30  # 30% cost savings for similar accuracy
 
 
+@dataclass(frozen=True)
+class CriteriaMetrics:
+    """
+    The four gating metrics, extracted from a metrics dict exactly once
+
+    Attribute access replaces repeated .get() hash lookups in the
+    evaluate/format/tag trio, and frozen means cached or shared instances
+    can't be mutated by a caller.
+    """
+
+    accuracy: float = 0.0
+    f1: float = 0.0
+    precision: float = 0.0
+    recall: float = 0.0
+    sentiment_accuracy: float = 0.0
+
+    @classmethod
+    def from_metrics(cls, metrics: Dict[str, float]) -> "CriteriaMetrics":
+        """Extract the gating metrics from a full metrics dictionary"""
+        return cls(
+            accuracy=metrics.get('category_accuracy', 0.0),
+            f1=metrics.get('category_f1_weighted', 0.0),
+            precision=metrics.get('category_precision_weighted', 0.0),
+            recall=metrics.get('category_recall_weighted', 0.0),
+            sentiment_accuracy=metrics.get('sentiment_accuracy', 0.0),
+        )
+
+
+def _threshold_table(
+    criteria: ProductionCriteria
+) -> Tuple[Tuple[str, str, float, str], ...]:
+    """Gate definitions as (display name, attribute, threshold, format spec)"""
+    return (
+        ("Accuracy", "accuracy", criteria.min_accuracy, ".2%"),
+        ("F1 score", "f1", criteria.min_f1_score, ".3f"),
+        ("Precision", "precision", criteria.min_precision, ".3f"),
+        ("Recall", "recall", criteria.min_recall, ".3f"),
+    )
+
+
+# The default thresholds are by far the common case - build their table
+# once at import instead of per evaluation
+_DEFAULT_THRESHOLDS = _threshold_table(ProductionCriteria())
+
+
 def evaluate_performance_criteria(
-    metrics: Dict[str, float],
+    metrics: Union[Dict[str, float], CriteriaMetrics],
     criteria: ProductionCriteria = None
 ) -> Tuple[bool, str]:
     """
     Evaluate if model meets minimum performance criteria
 
     Args:
-        metrics: Dictionary of model metrics
+        metrics: Metrics dictionary, or an already-extracted
+                 CriteriaMetrics (lets callers that extracted the values
+                 for display reuse them instead of re-reading the dict)
         criteria: ProductionCriteria instance (uses defaults if None)
 
     Returns:
         Tuple of (passes: bool, reason: str)
     """
-    if criteria is None:
-        criteria = ProductionCriteria()
-
-    reasons = []
-
-    # Check accuracy
-    accuracy = metrics.get('category_accuracy', 0.0)
-    if accuracy < criteria.min_accuracy:
-        reasons.append(f"Accuracy {accuracy:.2%} below {criteria.min_accuracy:.2%} threshold")
-
-    # Check F1 score
-    f1 = metrics.get('category_f1_weighted', 0.0)
-    if f1 < criteria.min_f1_score:
-        reasons.append(f"F1 score {f1:.3f} below {criteria.min_f1_score:.3f} threshold")
-
-    # Check precision
-    precision = metrics.get('category_precision_weighted', 0.0)
-    if precision < criteria.min_precision:
-        reasons.append(f"Precision {precision:.3f} below {criteria.min_precision:.3f} threshold")
-
-    # Check recall
-    recall = metrics.get('category_recall_weighted', 0.0)
-    if recall < criteria.min_recall:
-        reasons.append(f"Recall {recall:.3f} below {criteria.min_recall:.3f} threshold")
-
-    if reasons:
-        return False, "; ".join(reasons)
+    thresholds = _DEFAULT_THRESHOLDS if criteria is None else _threshold_table(criteria)
+    if not isinstance(metrics, CriteriaMetrics):
+        metrics = CriteriaMetrics.from_metrics(metrics)
+
+    # One comprehension over the table; string formatting only happens
+    # for gates that actually failed
+    failures = [
+        (name, value, threshold, fmt)
+        for name, attr, threshold, fmt in thresholds
+        if (value := getattr(metrics, attr)) < threshold
+    ]
+
+    if failures:
+        return False, "; ".join(
+            f"{name} {value:{fmt}} below {threshold:{fmt}} threshold"
+            for name, value, threshold, fmt in failures
+        )
 
     return True, "All performance criteria met"
 
@@ -144,41 +185,128 @@ def evaluate_cost_performance_tradeoff(
 
 
 def get_registration_tags(
-    metrics: Dict[str, float],
+    metrics: Union[Dict[str, float], CriteriaMetrics],
     track: str,
     provider: str,
     model: str,
     passes_criteria: bool,
-    reason: str
+    reason: str,
+    config_hash: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Generate tags for Unity Catalog model registration
 
     Args:
-        metrics: Model metrics
+        metrics: Model metrics (dict or already-extracted CriteriaMetrics)
         track: Track identifier (A or B)
         provider: Model provider
         model: Model name
         passes_criteria: Whether model passes production criteria
         reason: Reason for pass/fail
+        config_hash: Hash of (model, dataset) the experiment ran with;
+                     lets identical re-runs short-circuit before classifying
 
     Returns:
         Dictionary of tags
     """
+    if not isinstance(metrics, CriteriaMetrics):
+        metrics = CriteriaMetrics.from_metrics(metrics)
+
     tags = {
         "track": track,
         "provider": provider,
         "model": model,
-        "category_accuracy": str(round(metrics.get('category_accuracy', 0.0), 4)),
-        "category_f1": str(round(metrics.get('category_f1_weighted', 0.0), 4)),
-        "sentiment_accuracy": str(round(metrics.get('sentiment_accuracy', 0.0), 4)),
+        "category_accuracy": str(round(metrics.accuracy, 4)),
+        "category_f1": str(round(metrics.f1, 4)),
+        "category_precision": str(round(metrics.precision, 4)),
+        "category_recall": str(round(metrics.recall, 4)),
+        "sentiment_accuracy": str(round(metrics.sentiment_accuracy, 4)),
         "production_ready": str(passes_criteria).lower(),
         "validation_reason": reason[:250],  # Limit length
     }
 
+    if config_hash:
+        tags["config_hash"] = config_hash
+
     return tags
 
 
+def find_duplicate_config(
+    catalog: str,
+    schema: str,
+    model_name: str,
+    config_hash: str
+) -> Optional[Any]:
+    """
+    Find a registered version that ran with an identical configuration
+
+    Matching on the config_hash tag (same endpoint model, same dataset)
+    lets an experiment bail out before paying for any classification at
+    all, rather than discovering the duplicate after the full run.
+
+    Args:
+        catalog: Unity Catalog name
+        schema: Schema name
+        model_name: Model name
+        config_hash: Hash to look up
+
+    Returns:
+        The matching ModelVersion, or None
+    """
+    try:
+        full_model_name = f"{catalog}.{schema}.{model_name}"
+        for version in _list_version_details(full_model_name):
+            tags = getattr(version, 'tags', None) or {}
+            if tags.get('config_hash') == config_hash:
+                return version
+    except Exception:
+        # Registry unreachable - let the experiment proceed
+        return None
+    return None
+
+
+@lru_cache(maxsize=4)
+def _list_version_details(full_model_name: str) -> Tuple[Any, ...]:
+    """
+    Fetch all registered versions of a model (with tags) in one pass
+
+    check_duplicate_performance and get_champion_metrics both need the
+    same version list during a single registration path; caching one
+    search_model_versions scan lets them answer as pure Python filters
+    instead of each paying their own registry round-trips (and their own
+    failure timeout when Unity Catalog is unreachable).
+
+    Args:
+        full_model_name: Fully qualified model name (catalog.schema.model)
+
+    Returns:
+        Tuple of ModelVersion entities with tags populated
+    """
+    client = get_client()
+    versions = client.search_model_versions(f"name='{full_model_name}'")
+
+    # Some backends omit tags from search results - hydrate only those
+    detailed = []
+    for v in versions:
+        if getattr(v, 'tags', None):
+            detailed.append(v)
+        else:
+            detailed.append(client.get_model_version(full_model_name, v.version))
+
+    return tuple(detailed)
+
+
+def invalidate_version_cache() -> None:
+    """
+    Drop the cached registry version lists
+
+    Call after registering a new version so later gating checks in the
+    same process (e.g. sweeps) see it instead of the stale snapshot.
+    """
+    _list_version_details.cache_clear()
+    _champion_metrics_cached.cache_clear()
+
+
 def check_duplicate_performance(
     catalog: str,
     schema: str,
@@ -201,20 +329,16 @@ def check_duplicate_performance(
         Format: {'version': str, 'alias': str, 'provider': str, 'model': str}
     """
     try:
-        client = mlflow.MlflowClient()
         full_model_name = f"{catalog}.{schema}.{model_name}"
 
-        # Get all registered versions
-        versions = client.search_model_versions(f"name='{full_model_name}'")
+        # One cached registry scan shared with get_champion_metrics
+        versions = _list_version_details(full_model_name)
 
         if not versions:
             return None
 
         # Check each version for identical metrics
-        for v in versions:
-            # Get full version details with tags
-            version_detail = client.get_model_version(full_model_name, v.version)
-
+        for version_detail in versions:
             # Get metrics from tags (stored during registration)
             tags = version_detail.tags if hasattr(version_detail, 'tags') else {}
             existing_accuracy = float(tags.get('category_accuracy', -1.0))
@@ -248,6 +372,11 @@ def check_duplicate_performance(
         return None
 
 
+# How long a resolved champion stays valid; sweeps evaluating many
+# candidates within this window share one pair of REST calls
+_CHAMPION_TTL_SECONDS = 300
+
+
 def get_champion_metrics(
     catalog: str,
     schema: str,
@@ -257,6 +386,10 @@ def get_champion_metrics(
     """
     Get metrics from current champion model in Unity Catalog
 
+    Cached per (model, alias) for five minutes - a sweep comparing many
+    candidates against the same champion pays the registry round-trips
+    once instead of twice per candidate.
+
     Args:
         catalog: Unity Catalog name
         schema: Schema name
@@ -266,36 +399,101 @@ def get_champion_metrics(
     Returns:
         Dictionary of metrics from champion model, or None if no champion exists
     """
-    try:
-        client = mlflow.MlflowClient()
-        full_model_name = f"{catalog}.{schema}.{model_name}"
-
-        # Try to get model version by alias
-        try:
-            model_version = client.get_model_version_by_alias(full_model_name, alias)
-        except Exception:
-            # No champion exists yet
-            return None
+    full_model_name = f"{catalog}.{schema}.{model_name}"
+    ttl_bucket = int(time.time() // _CHAMPION_TTL_SECONDS)
+    cached = _champion_metrics_cached(full_model_name, alias, ttl_bucket)
+    # Fresh dict per caller so the cached entry can't be mutated
+    return dict(cached) if cached is not None else None
+
+
+@lru_cache(maxsize=128)
+def _champion_metrics_cached(
+    full_model_name: str,
+    alias: str,
+    ttl_bucket: int
+) -> Optional[Tuple[Tuple[str, float], ...]]:
+    """
+    Resolve champion metrics, cached until the TTL bucket rolls over
 
-        # Get run ID from model version
-        run_id = model_version.run_id
+    Args:
+        full_model_name: Fully qualified model name (catalog.schema.model)
+        alias: Alias to look up
+        ttl_bucket: Coarse timestamp; a new value expires older entries
 
-        # Get metrics from the run
-        run = client.get_run(run_id)
+    Returns:
+        Immutable (key, value) pairs, or None if no champion exists
+    """
+    try:
+        client = get_client()
+
+        # Resolve the alias from the cached version list first; fall back
+        # to the alias endpoint when search results carry no alias info
+        model_version = next(
+            (v for v in _list_version_details(full_model_name)
+             if alias in (getattr(v, 'aliases', None) or [])),
+            None
+        )
+        if model_version is None:
+            try:
+                model_version = client.get_model_version_by_alias(full_model_name, alias)
+            except Exception:
+                # No champion exists yet
+                return None
+
+        # Metrics are mirrored into version tags at registration time (see
+        # get_registration_tags), so tags answer without the get_run
+        # round-trip for any model registered by these experiments
+        tags = model_version.tags if hasattr(model_version, 'tags') else {}
+        if all(
+            key in tags
+            for key in ('category_accuracy', 'category_f1',
+                        'category_precision', 'category_recall')
+        ):
+            return (
+                ('category_accuracy', float(tags['category_accuracy'])),
+                ('category_f1_weighted', float(tags['category_f1'])),
+                ('category_precision_weighted', float(tags['category_precision'])),
+                ('category_recall_weighted', float(tags['category_recall'])),
+            )
+
+        # Champions whose tags don't carry the full metric set (registered
+        # before precision/recall were mirrored, or outside these
+        # experiments): fall back to the run
+        run = client.get_run(model_version.run_id)
         metrics = run.data.metrics
 
-        return {
-            'category_accuracy': metrics.get('category_accuracy', 0.0),
-            'category_f1_weighted': metrics.get('category_f1_weighted', 0.0),
-            'category_precision_weighted': metrics.get('category_precision_weighted', 0.0),
-            'category_recall_weighted': metrics.get('category_recall_weighted', 0.0),
-        }
+        return (
+            ('category_accuracy', metrics.get('category_accuracy', 0.0)),
+            ('category_f1_weighted', metrics.get('category_f1_weighted', 0.0)),
+            ('category_precision_weighted', metrics.get('category_precision_weighted', 0.0)),
+            ('category_recall_weighted', metrics.get('category_recall_weighted', 0.0)),
+        )
 
     except Exception as e:
         # Champion doesn't exist or other error
         return None
 
 
+# Rendered once per model in validation sweeps - parse the template a
+# single time at import instead of evaluating a dozen f-strings per call
+_MARKS = ("✅", "❌")
+_SUMMARY_BAR = "=" * 80
+_SUMMARY_TMPL = (
+    "{bar}\n"
+    "PRODUCTION CRITERIA EVALUATION\n"
+    "{bar}\n"
+    "\nPerformance Metrics:\n"
+    "  Accuracy:  {accuracy:.2%} {acc_mark} (threshold: {min_accuracy:.2%})\n"
+    "  F1 Score:  {f1:.3f} {f1_mark} (threshold: {min_f1:.3f})\n"
+    "  Precision: {precision:.3f} {prec_mark} (threshold: {min_precision:.3f})\n"
+    "  Recall:    {recall:.3f} {rec_mark} (threshold: {min_recall:.3f})\n"
+    "\n{bar}\n"
+    "{verdict}\n"
+    "Reason: {reason}\n"
+    "{bar}"
+)
+
+
 def format_criteria_summary(
     metrics: Dict[str, float],
     criteria: ProductionCriteria = None
@@ -313,31 +511,26 @@ def format_criteria_summary(
     if criteria is None:
         criteria = ProductionCriteria()
 
-    lines = []
-    lines.append("=" * 80)
-    lines.append("PRODUCTION CRITERIA EVALUATION")
-    lines.append("=" * 80)
-
-    # Performance metrics
-    accuracy = metrics.get('category_accuracy', 0.0)
-    f1 = metrics.get('category_f1_weighted', 0.0)
-    precision = metrics.get('category_precision_weighted', 0.0)
-    recall = metrics.get('category_recall_weighted', 0.0)
-
-    lines.append("\nPerformance Metrics:")
-    lines.append(f"  Accuracy:  {accuracy:.2%} {'✅' if accuracy >= criteria.min_accuracy else '❌'} (threshold: {criteria.min_accuracy:.2%})")
-    lines.append(f"  F1 Score:  {f1:.3f} {'✅' if f1 >= criteria.min_f1_score else '❌'} (threshold: {criteria.min_f1_score:.3f})")
-    lines.append(f"  Precision: {precision:.3f} {'✅' if precision >= criteria.min_precision else '❌'} (threshold: {criteria.min_precision:.3f})")
-    lines.append(f"  Recall:    {recall:.3f} {'✅' if recall >= criteria.min_recall else '❌'} (threshold: {criteria.min_recall:.3f})")
-
-    # Overall evaluation
-    passes, reason = evaluate_performance_criteria(metrics, criteria)
-    lines.append("\n" + "=" * 80)
-    if passes:
-        lines.append("✅ PASSES PRODUCTION CRITERIA")
-    else:
-        lines.append("❌ FAILS PRODUCTION CRITERIA")
-    lines.append(f"Reason: {reason}")
-    lines.append("=" * 80)
-
-    return "\n".join(lines)
\ No newline at end of file
+    # Extract once; the same values feed both the display lines and the
+    # pass/fail evaluation below
+    values = CriteriaMetrics.from_metrics(metrics)
+    passes, reason = evaluate_performance_criteria(values, criteria)
+
+    # Branchless mark selection: a bool indexes straight into the tuple
+    return _SUMMARY_TMPL.format(
+        bar=_SUMMARY_BAR,
+        accuracy=values.accuracy,
+        min_accuracy=criteria.min_accuracy,
+        acc_mark=_MARKS[values.accuracy < criteria.min_accuracy],
+        f1=values.f1,
+        min_f1=criteria.min_f1_score,
+        f1_mark=_MARKS[values.f1 < criteria.min_f1_score],
+        precision=values.precision,
+        min_precision=criteria.min_precision,
+        prec_mark=_MARKS[values.precision < criteria.min_precision],
+        recall=values.recall,
+        min_recall=criteria.min_recall,
+        rec_mark=_MARKS[values.recall < criteria.min_recall],
+        verdict=f"{_MARKS[not passes]} {'PASSES' if passes else 'FAILS'} PRODUCTION CRITERIA",
+        reason=reason,
+    )
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Content-addressed prompt/response cache for LLM agents
+
+Re-running an experiment after tweaking metrics or parsing re-sends
+identical prompts and re-pays the full API bill. Caching responses by a
+hash of (provider, model, prompt) makes iteration rounds nearly free:
+only genuinely new prompts hit the provider.
+"""
+
+import os
+import hashlib
+import sqlite3
+from datetime import datetime
+from typing import Optional
+
+
+class PromptCache:
+    """
+    SQLite-backed prompt→response cache
+
+    Modes:
+        read_write: return hits, store misses after the live call
+        replay:     return hits, raise on miss (strict offline re-runs)
+        off:        every lookup misses, nothing is stored
+    """
+
+    MODES = ("read_write", "replay", "off")
+
+    def __init__(self, db_path: str, mode: str = "read_write"):
+        """
+        Open (or create) the cache database
+
+        Args:
+            db_path: Path to the SQLite file
+            mode: One of 'read_write', 'replay', 'off'
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported cache mode: {mode} (expected one of {self.MODES})")
+
+        self.mode = mode
+        self.db_path = db_path
+        self._conn = None
+
+        if mode != "off":
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._conn = sqlite3.connect(db_path)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS prompt_cache (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model TEXT,
+                    prompt TEXT,
+                    response TEXT,
+                    created_at TEXT
+                )
+                """
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str) -> str:
+        """Content-addressed key: sha256 over provider, model and prompt"""
+        return hashlib.sha256(f"{provider}|{model}|{prompt}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached raw response
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached response text, or None on miss (read_write mode)
+
+        Raises:
+            KeyError: On miss in replay mode
+        """
+        if self.mode == "off":
+            return None
+
+        row = self._conn.execute(
+            "SELECT response FROM prompt_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is not None:
+            return row[0]
+
+        if self.mode == "replay":
+            raise KeyError(
+                f"Prompt cache miss in replay mode (key={key[:12]}…) - "
+                "re-run with --cache-mode read_write to populate the cache"
+            )
+
+        return None
+
+    def put(self, key: str, provider: str, model: str, prompt: str, response: str) -> None:
+        """Store a raw response (no-op outside read_write mode)"""
+        if self.mode != "read_write":
+            return
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO prompt_cache VALUES (?, ?, ?, ?, ?, ?)",
+            (key, provider, model, prompt, response, datetime.now().isoformat())
+        )
+        self._conn.commit()
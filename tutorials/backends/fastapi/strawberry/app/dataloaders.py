@@ -0,0 +1,56 @@
+# Per-request DataLoaders that batch database lookups.
+#
+# Without batching, a query like `suppliers { products { ... } }` issues one
+# SELECT per parent row (the classic N+1 pattern). A DataLoader collects all
+# keys requested during one event-loop tick and resolves them with a single
+# WHERE ... IN (...) query, returning results in key order.
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from strawberry.dataloader import DataLoader
+
+from app.db.postgres import ro_session_maker
+from app.models.product import Product, ProductModel
+from app.models.supplier import supplier_products
+
+
+def _to_graphql(product: Optional[ProductModel]) -> Optional[Product]:
+    """Wrap a SQLAlchemy product row in its GraphQL type."""
+    if product is None:
+        return None
+    return Product(row=product)
+
+
+async def load_products(product_ids: List[int]) -> List[Optional[Product]]:
+    """Batch-load products by id in one IN query, preserving input order."""
+    async with ro_session_maker() as session:
+        stmt = select(ProductModel).where(ProductModel.id.in_(product_ids))
+        result = await session.execute(stmt)
+        by_id = {p.id: p for p in result.scalars().all()}
+
+    return [_to_graphql(by_id.get(product_id)) for product_id in product_ids]
+
+
+async def load_products_by_supplier(supplier_ids: List[int]) -> List[List[Product]]:
+    """Batch-load each supplier's products in one join over the link table."""
+    async with ro_session_maker() as session:
+        stmt = (
+            select(supplier_products.c.supplier_id, ProductModel)
+            .join(ProductModel, ProductModel.id == supplier_products.c.product_id)
+            .where(supplier_products.c.supplier_id.in_(supplier_ids))
+        )
+        result = await session.execute(stmt)
+
+        grouped: Dict[int, List[Product]] = {sid: [] for sid in supplier_ids}
+        for supplier_id, product in result.all():
+            grouped[supplier_id].append(_to_graphql(product))
+
+    return [grouped[supplier_id] for supplier_id in supplier_ids]
+
+
+def get_context() -> dict:
+    """Build fresh loaders per request so caches don't leak across requests."""
+    return {
+        "product_loader": DataLoader(load_fn=load_products),
+        "supplier_products_loader": DataLoader(load_fn=load_products_by_supplier),
+    }
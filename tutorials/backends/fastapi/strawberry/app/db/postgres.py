@@ -1,30 +1,68 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+import asyncpg
+
+from app.config import get_settings
 
 def get_database_url():
-    """Get database URL from environment variables."""
-    POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "pass")
-    POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
-    POSTGRES_DB = os.getenv("POSTGRES_DB", "supplychain")
-    return f"postgresql+asyncpg://user:{POSTGRES_PASSWORD}@{POSTGRES_HOST}/{POSTGRES_DB}"
-
-def get_engine():
-    """Get database engine with current environment variables."""
-    return create_async_engine(get_database_url(), echo=True)
-
-def get_session():
-    """Get session factory with current environment variables."""
-    engine = get_engine()
-    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-# Create default engine and session factory
-engine = get_engine()
-async_session = get_session()
-
-async def get_pg_session() -> AsyncSession:
-    return async_session()
+    """Get database URL from the cached settings object."""
+    return get_settings().postgres_url
+
+def get_asyncpg_dsn():
+    """Plain asyncpg DSN (no SQLAlchemy dialect prefix)."""
+    return get_database_url().replace("postgresql+asyncpg://", "postgresql://", 1)
+
+# Shared raw asyncpg pool for paths that bypass SQLAlchemy (COPY, bulk
+# executemany). Created lazily; the statement cache survives across
+# acquisitions so repeated queries reuse server-side prepared statements.
+_pool = None
+
+async def init_pool(dsn: str = None) -> "asyncpg.Pool":
+    """Create the shared asyncpg pool on first call and return it.
+
+    dsn overrides the settings-derived DSN so callers that build their
+    own database URL (e.g. init_db.py) hit the same server with it.
+    """
+    global _pool
+    if _pool is None:
+        _pool = await asyncpg.create_pool(
+            dsn or get_asyncpg_dsn(),
+            min_size=5,
+            max_size=20,
+            max_queries=50_000,
+            max_inactive_connection_lifetime=300,
+            statement_cache_size=1024,
+        )
+    return _pool
+
+async def close_pool() -> None:
+    """Close the shared asyncpg pool (FastAPI shutdown / end of script)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+# Single module-level engine: one shared connection pool instead of a new
+# engine (and pool) per get_session() call. Per-statement SQL logging is
+# opt-in via SQL_ECHO=1 - it is heavy Python I/O on the hot path.
+engine = create_async_engine(
+    get_database_url(),
+    echo=os.getenv("SQL_ECHO") == "1",
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+    # Recycle connections after 30 minutes so idle ones don't outlive
+    # server/proxy timeouts and fail mid-request
+    pool_recycle=1800,
+)
+
+async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+# Read-only factory for the GraphQL resolvers: they never write, so the
+# pre-execute autoflush check is pure overhead
+ro_session_maker = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+def get_pg_session() -> AsyncSession:
+    """Return a new session from the shared pool (synchronous - no await needed)."""
+    return async_session_maker()
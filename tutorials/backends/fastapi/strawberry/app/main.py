@@ -0,0 +1,12 @@
+# FastAPI application entry point (referenced by `make run` / uvicorn app.main:app)
+from fastapi import FastAPI
+from strawberry.fastapi import GraphQLRouter
+
+from app.dataloaders import get_context
+from app.schema import schema
+
+app = FastAPI(title="Supply Chain GraphQL API")
+
+# context_getter builds the per-request DataLoaders used by the resolvers
+graphql_app = GraphQLRouter(schema, context_getter=get_context)
+app.include_router(graphql_app, prefix="/graphql")
@@ -1,4 +1,6 @@
-# Shared Base class for all models
-from sqlalchemy.ext.declarative import declarative_base
+# Shared Base class for all models - one registry, one MetaData
+from sqlalchemy.orm import DeclarativeBase
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    pass
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 import strawberry
+from strawberry.types import Info
 from typing import Optional
 
 from app.models import Base
@@ -11,50 +12,51 @@ class InventoryModel(Base):
     __tablename__ = "inventory"
 
     id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"))
-    quantity = Column(Integer, nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), index=True, nullable=False)
+    quantity = Column(Integer, nullable=False, server_default="0")
 
     product = relationship("ProductModel")
 
+    # Covering index: the hot ORDER BY product_id query reads only
+    # (product_id, quantity), so it can be answered from the index alone
+    __table_args__ = (Index("ix_inventory_product_qty", "product_id", "quantity"),)
+
 # Strawberry GraphQL type
 @strawberry.type
 class Inventory:
-    product: Product
+    product_id: strawberry.Private[int]
     quantity: int
-    
-    @strawberry.field
-    def total_value(self) -> float:
-        """Calculate total inventory value (quantity × price)."""
-        return self.quantity * self.product.price
-    
-    @strawberry.field
-    def total_value_formatted(self) -> str:
-        """Calculate formatted total inventory value."""
-        total = self.quantity * self.product.price
-        return f"${total:.2f}"
-    
-    @strawberry.field
-    def stock_status(self) -> str:
-        """Calculate stock status based on quantity."""
+    # Derived from quantity once in __post_init__; the fields are then plain
+    # attribute reads instead of re-branching on every GraphQL resolution
+    stock_status: str = ""
+    stock_status_description: str = ""
+    needs_restock: bool = False
+
+    def __post_init__(self):
+        self.needs_restock = self.quantity <= 10
         if self.quantity == 0:
-            return "OUT_OF_STOCK"
+            self.stock_status = "OUT_OF_STOCK"
+            self.stock_status_description = "Currently out of stock"
         elif self.quantity <= 10:
-            return "LOW_STOCK"
+            self.stock_status = "LOW_STOCK"
+            self.stock_status_description = f"Only {self.quantity} units remaining"
         else:
-            return "IN_STOCK"
-    
+            self.stock_status = "IN_STOCK"
+            self.stock_status_description = f"{self.quantity} units in stock"
+
     @strawberry.field
-    def stock_status_description(self) -> str:
-        """Get human-readable stock status description."""
-        status = self.stock_status
-        if status == "OUT_OF_STOCK":
-            return "Currently out of stock"
-        elif status == "LOW_STOCK":
-            return f"Only {self.quantity} units remaining"
-        else:
-            return f"{self.quantity} units in stock"
-    
+    async def product(self, info: Info) -> Product:
+        """Resolve the product through the per-request DataLoader."""
+        return await info.context["product_loader"].load(self.product_id)
+
     @strawberry.field
-    def needs_restock(self) -> bool:
-        """Calculate if product needs restocking."""
-        return self.quantity <= 10
+    async def total_value(self, info: Info) -> float:
+        """Calculate total inventory value (quantity × price)."""
+        product = await info.context["product_loader"].load(self.product_id)
+        return self.quantity * product.row.price
+
+    @strawberry.field
+    async def total_value_formatted(self, info: Info) -> str:
+        """Calculate formatted total inventory value."""
+        product = await info.context["product_loader"].load(self.product_id)
+        return f"${self.quantity * product.row.price:.2f}"
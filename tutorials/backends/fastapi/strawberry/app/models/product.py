@@ -10,22 +10,44 @@ class ProductModel(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    price = Column(Float, nullable=False, default=0.0)
+    # server_default lets bulk inserts omit the column when the value is
+    # the structural default, shrinking each row on the wire
+    price = Column(Float, nullable=False, default=0.0, server_default="0")
 
 # Strawberry GraphQL type
 @strawberry.type
 class Product:
-    id: int
-    name: str
-    description: Optional[str] = None
-    price: float = 0.0
-    
+    # Slots drop the per-instance __dict__ - material when a response
+    # wraps thousands of rows
+    __slots__ = ("row",)
+
+    # Wraps the ORM row instead of copying every column eagerly; fields
+    # read from the row on demand, so a query selecting one or two fields
+    # never pays for the rest
+    row: strawberry.Private[ProductModel]
+
+    @strawberry.field
+    def id(self) -> int:
+        return self.row.id
+
+    @strawberry.field
+    def name(self) -> str:
+        return self.row.name
+
+    @strawberry.field
+    def description(self) -> Optional[str]:
+        return self.row.description
+
+    @strawberry.field
+    def price(self) -> float:
+        return self.row.price
+
     @strawberry.field
     def price_formatted(self) -> str:
         """Calculate formatted price with currency symbol."""
-        return f"${self.price:.2f}"
-    
+        return f"${self.row.price:.2f}"
+
     @strawberry.field
     def is_premium(self) -> bool:
         """Calculate if product is premium (price > $50)."""
-        return self.price > 50.0
+        return self.row.price > 50.0
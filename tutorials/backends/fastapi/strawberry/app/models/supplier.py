@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 import strawberry
+from strawberry.types import Info
 from typing import List
 
 from app.models import Base
@@ -10,10 +11,16 @@ from app.models.product import Product
 supplier_products = Table(
     "supplier_products",
     Base.metadata,
-    Column("supplier_id", Integer, ForeignKey("suppliers.id")),
-    Column("product_id", Integer, ForeignKey("products.id")),
+    # Compound primary key: rejects duplicate links and its index serves
+    # supplier-led joins, so no separate supplier_id index is needed
+    Column("supplier_id", Integer, ForeignKey("suppliers.id"), primary_key=True),
+    Column("product_id", Integer, ForeignKey("products.id"), primary_key=True),
 )
 
+# Product-led joins (product → suppliers) need their own index; the
+# compound PK only covers lookups leading with supplier_id
+Index("ix_supplier_products_product", supplier_products.c.product_id)
+
 # SQLAlchemy model
 class SupplierModel(Base):
     __tablename__ = "suppliers"
@@ -25,6 +32,13 @@ class SupplierModel(Base):
 # Strawberry GraphQL type
 @strawberry.type
 class Supplier:
+    # No per-instance __dict__; supplier lists allocate leaner objects
+    __slots__ = ("id", "name")
+
     id: int
     name: str
-    products: List[Product]
+
+    @strawberry.field
+    async def products(self, info: Info) -> List[Product]:
+        """Resolve this supplier's products through the per-request DataLoader."""
+        return await info.context["supplier_products_loader"].load(self.id)
@@ -1,36 +1,64 @@
 import strawberry
+from strawberry.types import Info
 from typing import List
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from app.models.inventory import Inventory, InventoryModel
 from app.models.product import Product, ProductModel
-from app.db.postgres import get_pg_session
+from app.db.postgres import ro_session_maker
+
+# Inventory fields that need the product row to resolve
+_PRODUCT_FIELDS = {"product", "totalValue", "totalValueFormatted"}
+
+def _selects_product(selections) -> bool:
+    """Check whether any selection (even fragment-wrapped) needs the product row."""
+    for selection in selections:
+        # Plain field nodes carry arguments; fragment spreads and inline
+        # fragments don't - for those, look through to their sub-selections
+        if hasattr(selection, "arguments"):
+            if selection.name in _PRODUCT_FIELDS:
+                return True
+        elif _selects_product(selection.selections):
+            return True
+    return False
 
 @strawberry.type
 class Query:
     @strawberry.field
-    async def get_inventory(self) -> List[Inventory]:
-        session = await get_pg_session()
-        async with session:
-            # Use SQLAlchemy ORM with eager loading of product
-            stmt = (
-                select(InventoryModel)
-                .options(selectinload(InventoryModel.product))
-                .order_by(InventoryModel.product_id)
-            )
+    async def get_inventory(self, info: Info) -> List[Inventory]:
+        # Pick the query shape from the GraphQL selection: when the client
+        # asked for product data, one JOIN beats the loader's follow-up
+        # IN query; otherwise fetch inventory rows alone
+        wants_product = any(
+            _selects_product(field.selections) for field in info.selected_fields
+        )
+
+        async with ro_session_maker() as session:
+            if wants_product:
+                stmt = (
+                    select(InventoryModel, ProductModel)
+                    .join(ProductModel, InventoryModel.product_id == ProductModel.id)
+                    .order_by(InventoryModel.product_id)
+                )
+                result = await session.execute(stmt)
+                rows = result.all()
+
+                # Prime the loader so the product fields resolve from the
+                # joined rows without a second query
+                loader = info.context["product_loader"]
+                for item, product in rows:
+                    loader.prime(product.id, Product(row=product))
+
+                return [
+                    Inventory(product_id=item.product_id, quantity=item.quantity)
+                    for item, _ in rows
+                ]
+
+            stmt = select(InventoryModel).order_by(InventoryModel.product_id)
             result = await session.execute(stmt)
             inventory_items = result.scalars().all()
-            
+
             # Convert SQLAlchemy models to GraphQL types
             return [
-                Inventory(
-                    product=Product(
-                    id=item.product.id, 
-                    name=item.product.name, 
-                    description=item.product.description,
-                    price=item.product.price
-                ),
-                    quantity=item.quantity
-                ) for item in inventory_items
+                Inventory(product_id=item.product_id, quantity=item.quantity)
+                for item in inventory_items
             ]
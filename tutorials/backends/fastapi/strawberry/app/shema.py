@@ -1,23 +1,24 @@
 import strawberry
 from typing import List
-from app.models.product import Product
+from app.models.product import Product, ProductModel
 from app.models.supplier import Supplier
 from app.models.inventory import Inventory
 
-# Sample data for demonstration
-products_data = [
-    Product(id=1, name="Widget", description="Basic Widget"),
-    Product(id=2, name="Gadget", description="Advanced Gadget"),
-]
+# Static demo data, built once at import as immutable tuples; each
+# resolver is then an O(1) pointer return with no per-request rebuild
+products_data = (
+    Product(row=ProductModel(id=1, name="Widget", description="Basic Widget", price=19.99)),
+    Product(row=ProductModel(id=2, name="Gadget", description="Advanced Gadget", price=89.99)),
+)
 
-suppliers_data = [
-    Supplier(id=1, name="Acme Corp", products=products_data),
-]
+suppliers_data = (
+    Supplier(id=1, name="Acme Corp"),
+)
 
-inventory_data = [
-    Inventory(product=products_data[0], quantity=100),
-    Inventory(product=products_data[1], quantity=200),
-]
+inventory_data = (
+    Inventory(product_id=1, quantity=100),
+    Inventory(product_id=2, quantity=200),
+)
 
 @strawberry.type
 class Query:
@@ -5,21 +5,26 @@ Run this script to create all necessary database tables and sample data.
 """
 
 import asyncio
+import functools
+import logging
 import os
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.db.postgres import init_pool, close_pool
 from app.models import Base
 # Import models to register them with Base metadata
 from app.models.product import ProductModel
 from app.models.supplier import SupplierModel
 from app.models.inventory import InventoryModel
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (skippable so hot reloads
+# don't re-probe the filesystem)
+if os.getenv("SKIP_DOTENV") != "1":
+    load_dotenv()
 
+@functools.lru_cache(maxsize=1)
 def get_database_url():
-    """Get database URL from environment variables."""
+    """Get database URL from environment variables (computed once)."""
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "pass")
     POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
     POSTGRES_DB = os.getenv("POSTGRES_DB", "supplychain")
@@ -28,69 +33,93 @@ def get_database_url():
 # Build database URL from environment variables
 DATABASE_URL = get_database_url()
 
+log = logging.getLogger(__name__)
+
 async def init_database():
     """Initialize the database with all tables and sample data."""
-    print("Creating database engine...")
-    engine = create_async_engine(get_database_url(), echo=True)
-    
-    print("Creating database tables...")
+    log.info("Creating database engine...")
+    engine = create_async_engine(get_database_url(), echo=os.getenv("SQL_ECHO") == "1")
+
+    log.info("Creating database tables...")
     async with engine.begin() as conn:
-        # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
-    
-    print("Database tables created successfully!")
-    
-    # Create session for inserting sample data
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    print("Inserting sample data...")
-    async with async_session() as session:
-        # Create sample products with prices
-        product1 = ProductModel(name="Widget", description="Basic widget for everyday use", price=19.99)
-        product2 = ProductModel(name="Gadget", description="Advanced gadget with premium features", price=89.99)
-        product3 = ProductModel(name="Tool", description="Essential tool for professionals", price=45.50)
-        product4 = ProductModel(name="Device", description="Smart device with IoT capabilities", price=199.99)
-        
-        session.add_all([product1, product2, product3, product4])
-        await session.flush()  # Flush to get IDs
-        
-        # Create sample suppliers
-        supplier1 = SupplierModel(name="Acme Corp")
-        supplier2 = SupplierModel(name="Tech Solutions Inc")
-        supplier3 = SupplierModel(name="Global Supplies Ltd")
-        
-        session.add_all([supplier1, supplier2, supplier3])
-        await session.flush()
-        
-        # Create supplier-product relationships using the association table
-        from app.models.supplier import supplier_products
-        
-        # Add relationships to the association table
-        await session.execute(
-            supplier_products.insert().values([
-                {"supplier_id": supplier1.id, "product_id": product1.id},
-                {"supplier_id": supplier1.id, "product_id": product2.id},
-                {"supplier_id": supplier2.id, "product_id": product2.id},
-                {"supplier_id": supplier2.id, "product_id": product3.id},
-                {"supplier_id": supplier3.id, "product_id": product3.id},
-                {"supplier_id": supplier3.id, "product_id": product4.id},
-            ])
+        # Create all tables (DDL stays on SQLAlchemy metadata).
+        # checkfirst=False skips the per-table pg_catalog existence probe -
+        # this script targets a fresh database, as the COPY seed below
+        # would duplicate rows on a re-run anyway
+        await conn.run_sync(
+            lambda sync_conn: Base.metadata.create_all(sync_conn, checkfirst=False)
         )
-        
-        # Create sample inventory
-        inventory1 = InventoryModel(product_id=product1.id, quantity=100)
-        inventory2 = InventoryModel(product_id=product2.id, quantity=50)
-        inventory3 = InventoryModel(product_id=product3.id, quantity=75)
-        inventory4 = InventoryModel(product_id=product4.id, quantity=25)
-        
-        session.add_all([inventory1, inventory2, inventory3, inventory4])
-        
-        await session.commit()
-    
-    print("Sample data inserted successfully!")
+
+    log.info("Database tables created successfully!")
     await engine.dispose()
 
+    log.info("Inserting sample data...")
+    # Raw asyncpg for the seed rows: copy_records_to_table speaks the
+    # binary COPY protocol, skipping per-statement parsing and the ORM
+    # unit-of-work entirely; one transaction covers the whole seed.
+    # The connection comes from the app's canonical asyncpg pool, pointed
+    # at the same URL the DDL engine used (the POSTGRES_* vars) so DDL
+    # and seed can't diverge onto different hosts.
+    pool = await init_pool(
+        get_database_url().replace("postgresql+asyncpg://", "postgresql://", 1)
+    )
+    try:
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.copy_records_to_table(
+                "products",
+                records=[
+                    ("Widget", "Basic widget for everyday use", 19.99),
+                    ("Gadget", "Advanced gadget with premium features", 89.99),
+                    ("Tool", "Essential tool for professionals", 45.50),
+                    ("Device", "Smart device with IoT capabilities", 199.99),
+                ],
+                columns=["name", "description", "price"],
+            )
+            await conn.copy_records_to_table(
+                "suppliers",
+                records=[
+                    ("Acme Corp",),
+                    ("Tech Solutions Inc",),
+                    ("Global Supplies Ltd",),
+                ],
+                columns=["name"],
+            )
+
+            # COPY can't RETURNING - recover the serial ids in one SELECT each
+            product_ids = [r["id"] for r in await conn.fetch("SELECT id FROM products ORDER BY id")]
+            supplier_ids = [r["id"] for r in await conn.fetch("SELECT id FROM suppliers ORDER BY id")]
+
+            await conn.copy_records_to_table(
+                "supplier_products",
+                records=[
+                    (supplier_ids[0], product_ids[0]),
+                    (supplier_ids[0], product_ids[1]),
+                    (supplier_ids[1], product_ids[1]),
+                    (supplier_ids[1], product_ids[2]),
+                    (supplier_ids[2], product_ids[2]),
+                    (supplier_ids[2], product_ids[3]),
+                ],
+                columns=["supplier_id", "product_id"],
+            )
+            await conn.copy_records_to_table(
+                "inventory",
+                records=[
+                    (product_ids[0], 100),
+                    (product_ids[1], 50),
+                    (product_ids[2], 75),
+                    (product_ids[3], 25),
+                ],
+                columns=["product_id", "quantity"],
+            )
+    finally:
+        await close_pool()
+
+    log.info("Sample data inserted successfully!")
+
 if __name__ == "__main__":
-    print("Initializing Supply Chain GraphQL API database...")
+    # Progress output is opt-in: LOGLEVEL=INFO shows the phase messages,
+    # the default WARNING level short-circuits them in isEnabledFor
+    logging.basicConfig(level=os.getenv("LOGLEVEL", "WARNING"))
+    log.info("Initializing Supply Chain GraphQL API database...")
     asyncio.run(init_database())
-    print("Database initialization complete!")
+    log.info("Database initialization complete!")